@@ -0,0 +1,42 @@
+import argparse
+import sys
+
+from localsearch.adaptive import ADAPTIVE, noise_arg
+from localsearch.api import ALGORITHMS
+from localsearch.batch import iter_instances, solve_batch, write_jsonl
+
+# -----------------------#
+# Author: Phalguni Rathod
+# Student Id: R00183770
+# -----------------------#
+
+
+def main(argv=None):
+    """
+    Command line batch solver: solves every CNF file of a directory, glob or manifest over a worker pool &
+    streams one JSON line per instance (model, flips, time, seed) as soon as it is solved
+    :param argv: Command line arguments (without program name), sys.argv[1:] if not given
+    """
+    parser = argparse.ArgumentParser(description="Solve many CNF instances, one JSON line of results per instance")
+    parser.add_argument("source", help="Directory of CNF files, manifest file (one path per line) or glob pattern")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="gwsat")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes, 0 for all cores (default: 1)")
+    parser.add_argument("--restarts", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--wp", type=noise_arg(float), default=ADAPTIVE, help="walk probability or 'adaptive'")
+    parser.add_argument("--tl", type=noise_arg(int), default=ADAPTIVE, help="tabu length or 'adaptive'")
+    parser.add_argument("--output", help="JSON lines file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    params = {"restarts": args.restarts, "iterations": args.iterations, "wp": args.wp, "tl": args.tl}
+    results = solve_batch(iter_instances(args.source), args.algorithm, params, args.workers or None)
+    if args.output is None:
+        written = write_jsonl(results)
+    else:
+        with open(args.output, 'w') as file:
+            written = write_jsonl(results, file)
+    print(written, "results written", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
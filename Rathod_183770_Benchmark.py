@@ -0,0 +1,53 @@
+import argparse
+
+from localsearch.adaptive import noise_arg
+from localsearch.benchmark import SIZES, run_benchmark, run_flip_cost, write_report
+from localsearch.restarts import FIXED, PHASE_SAVING, RESTART_POLICIES
+
+# -----------------------#
+# Author: Phalguni Rathod
+# Student Id: R00183770
+# -----------------------#
+
+
+def main(argv=None):
+    """
+    Command line benchmark: generates random 3-SAT, runs GWSAT & WalkSAT with Tabu & writes the JSON report
+    :param argv: Command line arguments (without program name), sys.argv[1:] if not given
+    """
+    parser = argparse.ArgumentParser(description="Benchmark GWSAT & WalkSAT with Tabu on uniform random 3-SAT")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="Comma separated #variables (default: %(default)s)")
+    parser.add_argument("--ratio", type=float, default=4.26, help="Clauses / variables (default: %(default)s)")
+    parser.add_argument("--instances", type=int, default=3, help="Instances per size (default: %(default)s)")
+    parser.add_argument("--executions", type=int, default=10, help="Runs per instance (default: %(default)s)")
+    parser.add_argument("--restarts", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--wp", type=noise_arg(float), default=0.4, help="walk probability or 'adaptive'")
+    parser.add_argument("--tl", type=noise_arg(int), default=5, help="tabu length or 'adaptive'")
+    parser.add_argument("--restart-policy", choices=RESTART_POLICIES, default=FIXED,
+                        help="Flips per restart (default: %(default)s)")
+    parser.add_argument("--phase-saving", type=float, nargs="?", const=PHASE_SAVING,
+                        help="Restart from the best assignment with this share perturbed (default when given: %(const)s)")
+    parser.add_argument("--clause-weighting", action="store_true", help="PAWS-style clause weights for GWSAT")
+    parser.add_argument("--planted", action="store_true", help="Only satisfiable (planted) instances")
+    parser.add_argument("--flip-cost", action="store_true",
+                        help="Only time GWSAT steps with & without gain buckets over --sizes (e.g. 1000,10000,100000)")
+    parser.add_argument("--flips", type=int, default=2000, help="Steps timed per size for --flip-cost")
+    parser.add_argument("--output", help="JSON report file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.flip_cost:
+        sizes = [int(size) for size in args.sizes.split(",")] if args.sizes != parser.get_default("sizes") else None
+        write_report(run_flip_cost(sizes=sizes, ratio=args.ratio, flips=args.flips), args.output)
+        return
+    report = run_benchmark(sizes=[int(size) for size in args.sizes.split(",")], ratio=args.ratio,
+                           instances=args.instances, executions=args.executions, planted=args.planted,
+                           params={"restarts": args.restarts, "iterations": args.iterations,
+                                   "wp": args.wp, "tl": args.tl, "restart_policy": args.restart_policy,
+                                   "phase_saving": args.phase_saving, "clause_weighting": args.clause_weighting})
+    write_report(report, args.output)
+
+
+if __name__ == '__main__':
+    main()
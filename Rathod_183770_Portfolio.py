@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+
+from localsearch import DimacsError, GWSAT, WalkSAT_Tabu, read_formula
+from localsearch.portfolio import PortfolioMember, run_portfolio
+from localsearch.runner import execution_seed
+
+# -----------------------#
+# Author: Phalguni Rathod
+# Student Id: R00183770
+# -----------------------#
+
+GWSAT_WP = [0.2, 0.4, 0.6]  # wp settings raced for GWSAT
+WALKSAT_WP_TL = [(0.2, 3), (0.4, 5), (0.6, 10)]  # (wp, tl) settings raced for WalkSAT with Tabu
+SEEDS_PER_SETTING = 2
+
+
+def portfolio_members(restart, iterations, variables, formula):
+    """
+    Builds the portfolio: every GWSAT & WalkSAT with Tabu setting, each with SEEDS_PER_SETTING seeds
+    :param restart: #Restarts for every member
+    :param iterations: #iterations for every member
+    :param variables: List of variables involved in all clauses
+    :param formula: Formula of all clauses
+    :return: List of PortfolioMember
+    """
+    members = []
+    for k in range(SEEDS_PER_SETTING):
+        seed = execution_seed(k)
+        for wp in GWSAT_WP:
+            members.append(PortfolioMember("GWSAT wp=" + str(wp), GWSAT,
+                                           (restart, iterations, variables, formula, wp), seed))
+        for wp, tl in WALKSAT_WP_TL:
+            members.append(PortfolioMember("WalkSAT wp=" + str(wp) + " tl=" + str(tl), WalkSAT_Tabu,
+                                           (restart, iterations, variables, formula, wp, tl), seed))
+    return members
+
+
+def main(argv=None):
+    """
+    Command line portfolio: races all members & prints the winner
+    :param argv: Command line arguments, sys.argv if not given
+    """
+    argv = sys.argv if argv is None else argv
+    # --------- CMD Input & Outer Variable initialization ---------
+    if len(argv) < 4:
+        print("Error - Incorrect input")
+        print("Expecting python Rathod_183770_Portfolio.py [instance] [#Restarts] [#Iterarions] [#Workers]")
+        sys.exit(0)
+
+    try:
+        variables, formula = read_formula(argv[1], os.environ.get("LOCALSEARCH_CACHE"))
+    except (OSError, DimacsError) as error:
+        print("Error -", error)
+        sys.exit(0)
+    restart = int(argv[2])
+    iterations = int(argv[3])
+    workers = int(argv[4]) if len(argv) > 4 else None  # Optional, all cores by default
+
+    start_time = time.time()
+    winner = run_portfolio(portfolio_members(restart, iterations, variables, formula), workers)
+    end_time = time.time()
+
+    if winner is None:
+        print("No solution found by any portfolio member")
+    else:
+        print("Winner:", winner.name, "| seed:", winner.seed)
+        print("Flips:", winner.flips, "| Time:", winner.time, "secs")
+        print("Solution:", sorted(winner.solution))
+    print("\nTime Taken For Portfolio:", end_time - start_time, "secs\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import json
+
+from localsearch.api import ALGORITHMS
+from localsearch.server import request, serve
+
+# -----------------------#
+# Author: Phalguni Rathod
+# Student Id: R00183770
+# -----------------------#
+
+
+def main(argv=None):
+    """
+    Command line solver server: keeps warm worker processes & answers JSON line requests on a socket.
+    With --send it is the client instead: sends one CNF file to a running server & prints the reply.
+    :param argv: Command line arguments (without program name), sys.argv[1:] if not given
+    """
+    parser = argparse.ArgumentParser(description="GWSAT & WalkSAT with Tabu solver server (or client with --send)")
+    parser.add_argument("--socket", help="Unix-domain socket path (default: localhost TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8750)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--send", metavar="CNF", help="Client: solve this DIMACS file on the running server")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="gwsat", help="Client: algorithm")
+    parser.add_argument("--timeout", type=float, help="Client: seconds the run may take")
+    args = parser.parse_args(argv)
+
+    address = args.socket if args.socket is not None else (args.host, args.port)
+    if args.send is not None:
+        with open(args.send) as file:
+            dimacs = file.read()
+        print(json.dumps(request(address, dimacs, args.algorithm, timeout=args.timeout)))
+        return
+    try:
+        serve(args.socket, args.host, args.port, args.workers,
+              ready=lambda served: print("Serving on", served, flush=True))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
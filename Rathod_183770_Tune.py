@@ -0,0 +1,63 @@
+import argparse
+import json
+
+from localsearch.adaptive import noise_arg
+from localsearch.api import ALGORITHMS
+from localsearch.batch import iter_instances
+from localsearch.tuning import ALPHA, MIN_BLOCKS, tune
+
+# -----------------------#
+# Author: Phalguni Rathod
+# Student Id: R00183770
+# -----------------------#
+
+
+def values_arg(convert):
+    """
+    :param convert: float for wp, int for tl
+    :return: argparse type for a comma separated list of numbers (or 'adaptive')
+    """
+    parse = noise_arg(convert)
+    return lambda text: [parse(value) for value in text.split(",")]
+
+
+def main(argv=None):
+    """
+    Command line tuner: races wp (& tl) settings on training instances & prints the best one per instance family
+    :param argv: Command line arguments (without program name), sys.argv[1:] if not given
+    """
+    parser = argparse.ArgumentParser(description="Tune wp / tl per instance family with F-race style racing")
+    parser.add_argument("source", help="Directory of training CNF files, manifest file or glob pattern")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="walksat")
+    parser.add_argument("--wp", type=values_arg(float), default=[0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+                        help="Comma separated wp values (default: %(default)s)")
+    parser.add_argument("--tl", type=values_arg(int), default=[0, 3, 5, 10],
+                        help="Comma separated tl values, walksat only (default: %(default)s)")
+    parser.add_argument("--seeds", type=int, default=3, help="Runs per instance (default: %(default)s)")
+    parser.add_argument("--restarts", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--max-flips", type=int, default=100000, help="Flip budget per run (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes, 0 for all cores (default: 1)")
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    parser.add_argument("--min-blocks", type=int, default=MIN_BLOCKS)
+    parser.add_argument("--output", help="JSON report file (default: stdout)")
+    args = parser.parse_args(argv)
+    if args.seeds < 1:
+        parser.error("--seeds must be at least 1")
+
+    space = {"wp": args.wp}
+    if args.algorithm == "walksat":
+        space["tl"] = args.tl
+    params = {"restarts": args.restarts, "iterations": args.iterations, "max_flips": args.max_flips}
+    reports = tune(iter_instances(args.source), args.algorithm, space, params, args.seeds, args.workers or None,
+                   args.alpha, args.min_blocks)
+    text = json.dumps(reports, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w') as file:
+            file.write(text + "\n")
+
+
+if __name__ == '__main__':
+    main()
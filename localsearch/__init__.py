@@ -0,0 +1,33 @@
+"""
+GWSAT & WalkSAT (with Tabu) local search solvers.
+Importing this package has no side effects, and matplotlib & NumPy are only loaded when plotting or checking.
+
+    from localsearch import solve
+    result = solve("uf20-01.cnf", "walksat", {"wp": 0.4, "tl": 5, "seed": 1})
+"""
+from .adaptive import ADAPTIVE, AdaptiveNoise
+from .api import solve, load_formula, SolveResult, DEFAULT_PARAMS
+from .checker import sat_sol
+from .formula import Formula
+from .gwsat import GWSAT
+from .initialization import random_initialization
+from .modelcache import ModelCache, formula_key
+from .parser import DimacsError, parse_dimacs, read_formula, readFromFile
+from .preprocess import Simplification, preprocess
+from .restarts import RESTART_POLICIES, RestartSchedule, luby
+from .rng import RandomStream
+from .runner import run_executions
+from .scores import BucketScores, GainBuckets, IndexedSet, IncrementalScores, WeightedBucketScores, WeightedScores
+from .shared import SharedFormula, SharedFormulaFile
+from .stats import SearchMonitor
+from .walksat import WalkSAT_Tabu
+
+__all__ = [
+    "ADAPTIVE", "AdaptiveNoise",
+    "solve", "load_formula", "SolveResult", "DEFAULT_PARAMS",
+    "sat_sol", "Formula", "GWSAT", "random_initialization",
+    "DimacsError", "parse_dimacs", "read_formula", "readFromFile", "ModelCache", "formula_key",
+    "Simplification", "preprocess", "RESTART_POLICIES", "RestartSchedule", "luby", "RandomStream",
+    "run_executions", "BucketScores", "GainBuckets", "IndexedSet", "IncrementalScores", "WeightedBucketScores",
+    "WeightedScores", "SharedFormula", "SharedFormulaFile", "SearchMonitor", "WalkSAT_Tabu",
+]
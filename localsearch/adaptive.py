@@ -0,0 +1,83 @@
+ADAPTIVE = "adaptive"  # Value of wp / tl asking for adaptive noise instead of a fixed setting
+THETA = 1 / 6  # Stagnation: no improvement for THETA * #clauses steps
+PHI = 0.2  # Size of each noise adjustment
+TL_MAX = 10  # Largest tabu tenure adaptive tl goes up to
+
+
+def noise_arg(convert):
+    """
+    :param convert: float for wp, int for tl
+    :return: argparse type accepting a number or 'adaptive'
+    """
+    def parse(text):
+        return text if text == ADAPTIVE else convert(text)
+    return parse
+
+
+class AdaptiveNoise:
+    """
+    Adaptive noise in the style of Hoos' Adaptive Novelty+: noise starts at 0, is raised when #unsat clauses
+    hasn't improved for THETA * #clauses steps (wp += (1 - wp) * PHI) & lowered on every improvement
+    (wp -= wp * PHI / 2). Tabu tenure tl follows the same rule between 0 & tl_max.
+    Only the settings given as ADAPTIVE adapt, the other one keeps its fixed value.
+    """
+
+    def __init__(self, num_clauses, wp=ADAPTIVE, tl=ADAPTIVE, tl_max=TL_MAX):
+        """
+        :param num_clauses: No. of clauses of the formula
+        :param wp: Fixed walk probability, or ADAPTIVE
+        :param tl: Fixed tabu length, or ADAPTIVE
+        :param tl_max: Largest adaptive tabu length
+        """
+        self.adapt_wp = wp == ADAPTIVE
+        self.adapt_tl = tl == ADAPTIVE
+        self.wp = 0.0 if self.adapt_wp else wp
+        self._tl = 0.0 if self.adapt_tl else float(tl)
+        self.tl = int(round(self._tl))
+        self.tl_max = tl_max
+        self.stagnation = max(1, int(THETA * num_clauses))
+        self.step = 0
+        self._adapt_step = 0  # Step of last adjustment
+        self._adapt_unsat = None  # #Unsat at last adjustment
+
+    @classmethod
+    def for_params(cls, formula, wp, tl=None):
+        """
+        :param formula: Formula
+        :param wp: walk probability or ADAPTIVE
+        :param tl: tabu length or ADAPTIVE (None for GWSAT)
+        :return: AdaptiveNoise if wp or tl is ADAPTIVE, else None (fixed settings, nothing to update)
+        """
+        if wp != ADAPTIVE and tl != ADAPTIVE:
+            return None
+        return cls(formula.num_clauses, wp, 0 if tl is None else tl)
+
+    def restart(self, unsat):
+        """
+        New restart: noise levels are kept, improvement is measured from the new initial solution
+        :param unsat: #Unsat clauses of the initial solution
+        """
+        self._adapt_step = self.step
+        self._adapt_unsat = unsat
+
+    def update(self, unsat):
+        """
+        Called after each step
+        :param unsat: #Unsat clauses after the step
+        """
+        self.step += 1
+        if self._adapt_unsat is None or unsat < self._adapt_unsat:  # Progress: less noise
+            if self.adapt_wp:
+                self.wp -= self.wp * PHI / 2
+            if self.adapt_tl:
+                self._tl -= self._tl * PHI / 2
+        elif self.step - self._adapt_step > self.stagnation:  # Stagnation: more noise
+            if self.adapt_wp:
+                self.wp += (1 - self.wp) * PHI
+            if self.adapt_tl:
+                self._tl += (self.tl_max - self._tl) * PHI
+        else:
+            return
+        self.tl = int(round(self._tl))
+        self._adapt_step = self.step
+        self._adapt_unsat = unsat
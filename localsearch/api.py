@@ -0,0 +1,139 @@
+import time
+from collections import namedtuple
+
+from .adaptive import ADAPTIVE
+from .formula import Formula
+from .gwsat import GWSAT
+from .modelcache import formula_key
+from .parser import read_formula
+from .preprocess import preprocess
+from .restarts import FIXED
+from .rng import RandomStream
+from .walksat import WalkSAT_Tabu
+
+ALGORITHMS = ("gwsat", "walksat")
+DEFAULT_PARAMS = {
+    "restarts": 10,
+    "iterations": 1000,
+    "wp": ADAPTIVE,  # walk probability, or ADAPTIVE (AdaptiveNoise)
+    "tl": ADAPTIVE,  # tabu length or ADAPTIVE, only used by walksat
+    "seed": None,  # Seed of the run's own RandomStream, drawn from the global random module if None
+    "stop": None,  # Optional Event, search gives up once it is set
+    "monitor": None,  # Optional SearchMonitor, counters/timers/trace of the run
+    "preprocess": False,  # Unit propagation, pure literals, tautology & duplicate removal before search
+    "subsumption": False,  # Also remove subsumed clauses while preprocessing
+    "max_flips": None,  # Flip budget over all restarts
+    "time_limit": None,  # Wall-clock budget (seconds) over all restarts
+    "restart_policy": FIXED,  # fixed, luby, geometric or stagnation (RestartSchedule)
+    "phase_saving": None,  # Share of variables perturbed when restarting from the best assignment, None: random
+    "clause_weighting": False,  # PAWS-style clause weights for GSAT scoring, only used by gwsat
+    "gain_buckets": None,  # Pick GSAT moves from buckets by net gain, None: from BUCKET_VARS variables on (gwsat)
+    "cache": None,  # Optional ModelCache, known models are returned at once & new ones stored
+    "warm_start": None,  # List of literals to start from, the nearest cached model if None & a cache is given
+    "walkers": None,  # Run this many walks in lockstep with NumPy (lockstep module), seeded by seed
+}
+
+# Params the lockstep engine (walkers) has no use for, solve() refuses them with walkers instead of ignoring them
+LOCKSTEP_UNSUPPORTED = ("monitor", "max_flips", "restart_policy", "phase_saving", "clause_weighting", "gain_buckets",
+                        "cache", "warm_start")
+
+# solution: List of literals, or -1 if not found
+# status: solved, exhausted (all restarts used), flip_budget, time_budget, stopped, unsat (found by preprocessing)
+#         or cached (model of the same formula found in the cache)
+# best, best_unsat: Assignment with fewest unsat clauses seen & that count, the anytime (MAX-SAT style) answer
+SolveResult = namedtuple("SolveResult", ["algorithm", "solution", "flips", "time", "status", "best", "best_unsat"])
+
+
+def load_formula(formula):
+    """
+    :param formula: Formula, path of a DIMACS CNF file (plain, gzip or xz), or 2D List of clauses
+    :return: (List of variables, Formula)
+    """
+    if isinstance(formula, Formula):
+        return list(range(1, formula.num_vars + 1)), formula
+    if isinstance(formula, str):
+        return read_formula(formula)
+    formula = Formula.from_clauses(formula)
+    return list(range(1, formula.num_vars + 1)), formula
+
+
+def solve(formula, algorithm="gwsat", params=None):
+    """
+    Solves formula with GWSAT or WalkSAT with Tabu.
+    :param formula: Formula, path of a DIMACS CNF file, or 2D List of clauses
+    :param algorithm: "gwsat" or "walksat"
+    :param params: Dictionary overriding DEFAULT_PARAMS (restarts, iterations, wp, tl, seed, stop, monitor,
+                   preprocess, subsumption, max_flips, time_limit, restart_policy, phase_saving,
+                   clause_weighting, gain_buckets, cache, warm_start, walkers)
+                   With walkers, restarts, iterations, wp, tl, seed, stop & time_limit apply to the lockstep engine
+    :return: SolveResult(algorithm, solution, flips, time, status, best, best_unsat)
+    :raises ValueError: Unknown algorithm or parameter, or walkers with a LOCKSTEP_UNSUPPORTED param
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError("Unknown algorithm " + repr(algorithm) + ", expected one of " + str(ALGORITHMS))
+    options = dict(DEFAULT_PARAMS)
+    options.update(params or {})
+    unknown = set(options) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError("Unknown parameters: " + ", ".join(sorted(unknown)))
+    if options["walkers"] is not None:
+        unsupported = [name for name in LOCKSTEP_UNSUPPORTED if options[name] != DEFAULT_PARAMS[name]]
+        if unsupported:
+            raise ValueError("Not supported with walkers: " + ", ".join(unsupported))
+
+    variables, formula = load_formula(formula)
+    start_process = time.time()
+    cache = options["cache"]
+    warm_start = options["warm_start"]
+    if cache is not None:
+        key = formula_key(formula)
+        model = cache.get(key)
+        if model is not None:
+            return SolveResult(algorithm, model, 0, time.time() - start_process, "cached", model, 0)
+        if warm_start is None:
+            warm_start = cache.nearest(formula)
+    simplification = None
+    if options["preprocess"]:
+        simplification = preprocess(formula.clauses(), formula.num_vars, options["subsumption"])
+        if simplification.unsat:  # Conflict found by unit propagation, no solution exists
+            return SolveResult(algorithm, -1, 0, time.time() - start_process, "unsat", None, None)
+        variables, formula = simplification.variables(), simplification.formula()
+        if warm_start is not None:
+            warm_start = simplification.reduce(warm_start)
+    rng = None if options["seed"] is None else RandomStream(options["seed"])
+    stats = {}
+    if options["walkers"] is not None:
+        from .lockstep import GWSAT_Lockstep, WalkSAT_Tabu_Lockstep  # NumPy is only loaded for lockstep walkers
+        lockstep = {"walkers": options["walkers"], "seed": options["seed"], "stop": options["stop"],
+                    "stats": stats, "time_limit": options["time_limit"]}
+        if algorithm == "gwsat":
+            sol = GWSAT_Lockstep(options["restarts"], options["iterations"], variables, formula, options["wp"],
+                                 **lockstep)
+        else:
+            sol = WalkSAT_Tabu_Lockstep(options["restarts"], options["iterations"], variables, formula,
+                                        options["wp"], options["tl"], **lockstep)
+    elif algorithm == "gwsat":
+        sol = GWSAT(options["restarts"], options["iterations"], variables, formula, options["wp"],
+                    stop=options["stop"], stats=stats, monitor=options["monitor"],
+                    max_flips=options["max_flips"], time_limit=options["time_limit"],
+                    restart_policy=options["restart_policy"], phase_saving=options["phase_saving"],
+                    clause_weighting=options["clause_weighting"], warm_start=warm_start,
+                    gain_buckets=options["gain_buckets"], rng=rng)
+    else:
+        sol = WalkSAT_Tabu(options["restarts"], options["iterations"], variables, formula, options["wp"],
+                           options["tl"], stop=options["stop"], stats=stats, monitor=options["monitor"],
+                           max_flips=options["max_flips"], time_limit=options["time_limit"],
+                           restart_policy=options["restart_policy"], phase_saving=options["phase_saving"],
+                           warm_start=warm_start, rng=rng)
+    best = stats.get("best")
+    if simplification is not None:
+        # Model of the reduced formula --> model of the original one
+        if sol != -1:
+            sol = simplification.extend(sol)
+        if best is not None:
+            best = simplification.extend(best)
+    if cache is not None and sol != -1:
+        cache.put(key, sol)
+    end_process = time.time()
+    return SolveResult(algorithm, sol, stats.get("flips", 0), end_process - start_process, stats.get("status"),
+                       best, stats.get("best_unsat"))
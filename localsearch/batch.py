@@ -0,0 +1,105 @@
+import glob
+import json
+import os
+import sys
+from itertools import islice
+
+from .api import solve
+from .parser import DimacsError
+from .runner import execution_seed
+
+CNF_SUFFIXES = (".cnf", ".cnf.gz", ".cnf.xz")
+IN_FLIGHT = 2  # Instances queued per worker, so the pool never runs dry but the batch is never all in memory
+
+
+def iter_instances(source):
+    """
+    Paths of the CNF files of a batch, yielded one at a time
+    :param source: Directory (its CNF files, sorted by name), manifest file (one path per line, relative to the
+                   manifest, blank lines & lines starting with # skipped) or glob pattern (matches sorted by path)
+    :return: Generator of paths
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.endswith(CNF_SUFFIXES):
+                yield os.path.join(source, name)
+    elif os.path.isfile(source) and not source.endswith(CNF_SUFFIXES):
+        base = os.path.dirname(source)
+        with open(source) as manifest:
+            for line in manifest:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield os.path.join(base, line)
+    elif os.path.isfile(source):
+        yield source
+    else:
+        yield from sorted(glob.glob(source))  # Not filesystem order, so instance seeds don't depend on it
+
+
+def solve_instance(index, path, algorithm, params):
+    """
+    Parses & solves one instance of a batch, seeded by its position so results don't depend on #workers
+    :param index: Position of the instance in the batch
+    :param path: CNF file
+    :param algorithm: "gwsat" or "walksat"
+    :param params: solve() params
+    :return: Result dictionary: index, instance, algorithm, seed, status, solution (list of literals or -1),
+             flips, time, best_unsat; or index, instance, error if the file can't be read
+    """
+    seed = execution_seed(index)
+    options = dict(params or {})
+    options["seed"] = seed
+    try:
+        result = solve(path, algorithm, options)
+    except (OSError, DimacsError) as error:
+        return {"index": index, "instance": path, "error": str(error)}
+    return {"index": index, "instance": path, "algorithm": algorithm, "seed": seed, "status": result.status,
+            "solution": result.solution, "flips": result.flips, "time": result.time,
+            "best_unsat": result.best_unsat}
+
+
+def _solve_job(job):
+    return solve_instance(*job)
+
+
+def solve_batch(paths, algorithm="gwsat", params=None, workers=1):
+    """
+    Solves many instances over a process pool, yielding each result as soon as it is done (not in batch order).
+    Only paths are sent to the workers, each worker parses its own instance, and at most IN_FLIGHT * workers
+    instances are queued at a time, so memory doesn't grow with the size of the batch.
+    :param paths: Iterable of CNF files, e.g. iter_instances()
+    :param algorithm: "gwsat" or "walksat"
+    :param params: solve() params (picklable ones, seed is set per instance)
+    :param workers: #Worker processes, 1 solves in this process, None uses all cores
+    :return: Generator of result dictionaries (see solve_instance)
+    """
+    jobs = ((index, path, algorithm, params) for index, path in enumerate(paths))
+    if workers == 1:
+        for job in jobs:
+            yield _solve_job(job)
+        return
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait  # Only loaded when a pool is asked for
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        limit = IN_FLIGHT * (workers or os.cpu_count() or 1)
+        pending = {pool.submit(_solve_job, job) for job in islice(jobs, limit)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            pending |= {pool.submit(_solve_job, job) for job in islice(jobs, len(done))}
+
+
+def write_jsonl(results, file=None):
+    """
+    Writes one JSON line per result, flushed as each one arrives
+    :param results: Iterable of result dictionaries
+    :param file: Open text file, stdout if None
+    :return: No. of results written
+    """
+    file = file or sys.stdout
+    written = 0
+    for result in results:
+        file.write(json.dumps(result) + "\n")
+        file.flush()
+        written += 1
+    return written
@@ -0,0 +1,196 @@
+import json
+import platform
+import time
+import tracemalloc
+
+from .formula import Formula
+from .generator import uniform_3sat
+from .gwsat import GSAT, GWSAT, RandomWalk
+from .initialization import random_initialization
+from .restarts import FIXED
+from .rng import RandomStream
+from .runner import execution_seed
+from .scores import BucketScores, IncrementalScores
+from .walksat import WalkSAT_Tabu
+
+SIZES = [20, 50, 100, 250]  # uf20 up to uf250
+PERCENTILES = [50, 90, 99]
+FLIP_COST_SIZES = [1000, 10000, 100000]  # #variables of the per-flip cost benchmark
+
+
+def percentile(values, p):
+    """
+    :param values: Sorted list of numbers
+    :param p: Percentile, 0..100
+    :return: Nearest-rank percentile, None if values is empty
+    """
+    if not values:
+        return None
+    rank = max(1, int(-(-p * len(values) // 100)))  # ceil(p/100 * n)
+    return values[min(rank, len(values)) - 1]
+
+
+def summary(values):
+    """
+    :param values: List of numbers
+    :return: Dictionary of mean & percentiles
+    """
+    values = sorted(values)
+    result = {"mean": sum(values) / len(values) if values else None}
+    for p in PERCENTILES:
+        result["p" + str(p)] = percentile(values, p)
+    return result
+
+
+def run_solver(algorithm, variables, formula, params, stats, seed):
+    """
+    One run of algorithm with params (restarts, iterations, wp, tl, restart_policy, phase_saving, clause_weighting)
+    seeded with seed
+    :return: Solution list or -1
+    """
+    schedule = {"restart_policy": params["restart_policy"], "phase_saving": params["phase_saving"],
+                "rng": RandomStream(seed)}
+    if algorithm == "gwsat":
+        return GWSAT(params["restarts"], params["iterations"], variables, formula, params["wp"], stats=stats,
+                     clause_weighting=params["clause_weighting"], **schedule)
+    return WalkSAT_Tabu(params["restarts"], params["iterations"], variables, formula, params["wp"], params["tl"],
+                        stats=stats, **schedule)
+
+
+def peak_memory(algorithm, clauses, num_vars, params):
+    """
+    Peak Python memory of building the formula & one seeded run, measured on its own since tracing slows the run
+    :return: Peak bytes allocated
+    """
+    tracemalloc.start()
+    try:
+        formula = Formula.from_clauses(clauses, num_vars)
+        run_solver(algorithm, list(range(1, num_vars + 1)), formula, params, {}, execution_seed(0))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_instance(name, clauses, num_vars, algorithm, params, executions):
+    """
+    Runs executions seeded runs of algorithm on one instance
+    :return: Dictionary of flips/second, success rate, time & flips to solution percentiles, peak memory
+    """
+    formula = Formula.from_clauses(clauses, num_vars)
+    variables = list(range(1, num_vars + 1))
+    solved_times = []
+    solved_flips = []
+    total_flips = 0
+    total_time = 0.0
+    for full_exe in range(executions):
+        stats = {}
+        start = time.perf_counter()
+        sol = run_solver(algorithm, variables, formula, params, stats, execution_seed(full_exe))
+        elapsed = time.perf_counter() - start
+        total_flips += stats.get("flips", 0)
+        total_time += elapsed
+        if sol != -1:
+            solved_times.append(elapsed)
+            solved_flips.append(stats.get("flips", 0))
+    return {
+        "instance": name,
+        "variables": num_vars,
+        "clauses": len(clauses),
+        "algorithm": algorithm,
+        "params": params,
+        "executions": executions,
+        "success_rate": len(solved_times) / executions,
+        "flips_per_second": total_flips / total_time if total_time > 0 else None,
+        "time_to_solution": summary(solved_times),
+        "flips_to_solution": summary(solved_flips),
+        "peak_memory_bytes": peak_memory(algorithm, clauses, num_vars, params),
+    }
+
+
+def run_benchmark(sizes=None, ratio=4.26, instances=3, executions=10, params=None, planted=False,
+                  algorithms=("gwsat", "walksat")):
+    """
+    Generates uniform random 3-SAT instances with fixed seeds & runs both solvers on each.
+    :param sizes: List of #variables, SIZES if not given
+    :param ratio: Clauses / variables
+    :param instances: Instances (seeds 0..instances-1) per size
+    :param executions: Seeded runs per instance & algorithm
+    :param params: Dictionary of restarts, iterations, wp, tl, restart_policy, phase_saving, clause_weighting
+    :param planted: Generate satisfiable (planted) instances only
+    :param algorithms: Algorithms to run
+    :return: Report dictionary, json serializable
+    """
+    options = {"restarts": 10, "iterations": 10000, "wp": 0.4, "tl": 5, "restart_policy": FIXED,
+               "phase_saving": None, "clause_weighting": False}
+    options.update(params or {})
+    results = []
+    for num_vars in sizes or SIZES:
+        for seed in range(instances):
+            clauses = uniform_3sat(num_vars, ratio, seed, planted)
+            name = "uf" + str(num_vars) + "-r" + str(ratio) + "-s" + str(seed)
+            for algorithm in algorithms:
+                results.append(benchmark_instance(name, clauses, num_vars, algorithm, options, executions))
+    return {
+        "config": {"sizes": list(sizes or SIZES), "ratio": ratio, "instances": instances,
+                   "executions": executions, "params": options, "planted": planted},
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def step_cost(formula, score_class, flips, wp):
+    """
+    Times flips GWSAT steps (random walk or GSAT pick, then flip) from a random assignment,
+    building the scores is left out so only the per-step cost is measured
+    :return: Seconds per step
+    """
+    variables = list(range(1, formula.num_vars + 1))
+    rng = RandomStream(execution_seed(0))
+    scores = score_class(formula, formula.assignment(random_initialization(variables, rng)))
+    start = time.perf_counter()
+    for _ in range(flips):
+        if not scores.unsat:
+            break
+        flip_var = RandomWalk(scores, rng) if rng.random() < wp else GSAT(scores, rng)
+        scores.flip(flip_var)
+    return (time.perf_counter() - start) / max(scores.flips, 1)
+
+
+def run_flip_cost(sizes=None, ratio=4.26, flips=2000, wp=0.4, seed=0):
+    """
+    Cost of a GWSAT step as the #variables grows, scanning every variable (IncrementalScores)
+    vs picking from gain buckets (BucketScores). The first grows with #variables, the second should stay flat.
+    :param sizes: List of #variables, FLIP_COST_SIZES if not given
+    :param ratio: Clauses / variables
+    :param flips: Steps timed per size & mode
+    :param wp: walk probability of the steps
+    :param seed: Seed of the uniform random 3-SAT instances
+    :return: Report dictionary, json serializable
+    """
+    results = []
+    for num_vars in sizes or FLIP_COST_SIZES:
+        formula = Formula.from_clauses(uniform_3sat(num_vars, ratio, seed), num_vars)
+        scan = step_cost(formula, IncrementalScores, flips, wp)
+        buckets = step_cost(formula, BucketScores, flips, wp)
+        results.append({"variables": num_vars, "clauses": formula.num_clauses,
+                        "scan_us_per_flip": scan * 1e6, "buckets_us_per_flip": buckets * 1e6})
+    return {
+        "config": {"sizes": list(sizes or FLIP_COST_SIZES), "ratio": ratio, "flips": flips, "wp": wp, "seed": seed},
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def write_report(report, fName=None):
+    """
+    :param report: Report from run_benchmark() or run_flip_cost()
+    :param fName: JSON file to write, printed to stdout if None
+    """
+    text = json.dumps(report, indent=2)
+    if fName is None:
+        print(text)
+    else:
+        with open(fName, 'w') as file:
+            file.write(text + "\n")
@@ -0,0 +1,52 @@
+# sat_sol() & readFromFile() are taken from Dr. Grimes solution for lab - Sat Checker, with some modification to make the
+# code suitable for my usage. And Hence, I changed the names.
+def sat_sol(clauses, data_sol):
+    """
+    Modified version of Dr. Grimes Sat Checker
+    Kept as a list returning wrapper over localsearch.vectorized.ClauseMatrix
+    :param clauses: Takes the 2D-List of clauses
+    :param data_sol: List of Solution
+    :return: True/False: If Given Solution fits all the given clauses
+             Unsat_List: List of Unsatisfied clauses
+             Sat_List:  List of Unsatisfied clauses
+    """
+    from .vectorized import ClauseMatrix  # NumPy is only loaded once a solution is checked
+
+    def readSolution(data):
+        """
+        Reads data in list form & returns values of variables, indexed by variable
+        :param data: List of Solution
+        :return: bytearray of Variables, 1 for positive literal & 0 for negative
+        """
+        vars = bytearray(max((abs(int(literal)) for literal in data), default=0) + 1)  # Indexed by variable
+        for literal in data:
+            literal = int(literal)
+            var = literal
+            if var < 0:
+                vars[-var] = 0
+            else:
+                vars[var] = 1
+        return vars
+
+    def solutionStatus(instance, sol):
+        """
+        Modified version of Dr. Grimes Sat Checker
+        This function checks if given solution is valid for given instances/clauses
+        :param instance: List of all clauses
+        :param sol: List of literals
+        :return: True/False: If Given Solution fits all the given clauses
+             Unsat_List: List of Unsatisfied clauses
+             Sat_List:  List of Unsatisfied clauses
+        """
+        # Status of all clauses is found at once on the padded literal matrix
+        unsat_mask = ClauseMatrix.from_clauses(instance, len(sol) - 1).unsat_mask(sol)
+        unsat_sol = [clause_i for clause_i, unsat in zip(instance, unsat_mask) if unsat]
+        sat_sol = [clause_i for clause_i, unsat in zip(instance, unsat_mask) if not unsat]
+        if len(unsat_sol) > 0:
+            return [False, unsat_sol, sat_sol]
+        return [True, unsat_sol, sat_sol]
+
+    solution = readSolution(data_sol)
+    output = solutionStatus(clauses, solution)
+
+    return output
@@ -0,0 +1,122 @@
+from array import array
+
+
+class Formula:
+    """
+    Compact clause storage shared by both solvers.
+    Clauses are stored CSR-style in flat arrays instead of a list of lists:
+        literals of clause c are literals[offsets[c]:offsets[c + 1]]
+    Occurrence lists are stored the same way, indexed by literal + num_vars:
+        clauses containing literal l are occ_clauses[occ_offsets[l + num_vars]:occ_offsets[l + num_vars + 1]]
+    Assignments are bytearrays indexed by variable (index 0 unused), 1 for True & 0 for False.
+    A literal is stored once per clause (repeats are legal DIMACS but would be counted twice by the scores) & clauses
+    with a literal & its negation (tautologies, always satisfied) are left out: the scores assume a variable occurs
+    at most once per clause.
+    """
+
+    ARRAYS = ("literals", "offsets", "occ_offsets", "occ_clauses")
+
+    def __init__(self, num_vars, literals, offsets, occ_offsets=None, occ_clauses=None):
+        """
+        :param num_vars: No. of variables, variables are 1..num_vars
+        :param literals: array('i') of all literals of all clauses, one clause after the other
+        :param offsets: array('i') of start of each clause in literals, plus the end of the last one
+        :param occ_offsets: Occurrence list offsets, built from the clauses if not given
+        :param occ_clauses: Occurrence list clause indices, built from the clauses if not given
+        Any of the arrays can also be a memoryview of C ints, e.g. over a memory-mapped cache file.
+        """
+        self.num_vars = num_vars
+        self.num_clauses = len(offsets) - 1
+        self.literals = literals
+        self.offsets = offsets
+        if occ_offsets is None or occ_clauses is None:
+            occ_offsets, occ_clauses = self._build_occurrences()
+        self.occ_offsets = occ_offsets
+        self.occ_clauses = occ_clauses
+
+    def __getstate__(self):
+        # memoryviews (of a memory-mapped cache file) can't be pickled, send them to workers as arrays
+        state = dict(self.__dict__)
+        for name in self.ARRAYS:
+            if isinstance(state[name], memoryview):
+                state[name] = array('i', state[name].tobytes())
+        return state
+
+    @classmethod
+    def from_clauses(cls, clauses, num_vars=None):
+        """
+        :param clauses: 2D List of clauses, as returned by readFromFile()
+        :param num_vars: No. of variables, highest variable in clauses if not given
+        :return: Formula
+        """
+        literals = array('i')
+        offsets = array('i', [0])
+        highest = 0
+        for clause_i in clauses:
+            clause = dict.fromkeys(clause_i)  # Repeated literals dropped, order kept
+            highest = max(highest, max(map(abs, clause), default=0))
+            if any(-literal in clause for literal in clause):  # Tautology
+                continue
+            literals.extend(clause)
+            offsets.append(len(literals))
+        if num_vars is None:
+            num_vars = highest  # Variables only in tautologies count too
+        return cls(num_vars, literals, offsets)
+
+    def _build_occurrences(self):
+        # Count occurrences of each literal, then prefix sums give where each literal's list starts
+        n = self.num_vars
+        counts = array('i', [0]) * (2 * n + 2)
+        for literal in self.literals:
+            counts[literal + n + 1] += 1
+        for i in range(1, len(counts)):
+            counts[i] += counts[i - 1]
+        occ_offsets = array('i', counts)
+        occ_clauses = array('i', [0]) * len(self.literals)
+        fill = array('i', counts)
+        offsets = self.offsets
+        for c_index in range(self.num_clauses):
+            for k in range(offsets[c_index], offsets[c_index + 1]):
+                slot = self.literals[k] + n
+                occ_clauses[fill[slot]] = c_index
+                fill[slot] += 1
+        return occ_offsets, occ_clauses
+
+    def clause(self, c_index):
+        """
+        :param c_index: Index of clause
+        :return: List of literals of that clause
+        """
+        return self.literals[self.offsets[c_index]:self.offsets[c_index + 1]].tolist()
+
+    def clauses(self):
+        """
+        :return: 2D List of clauses
+        """
+        return [self.clause(c_index) for c_index in range(self.num_clauses)]
+
+    def occurrences(self, literal):
+        """
+        :param literal: Literal
+        :return: Indices of clauses in which literal appears
+        """
+        slot = literal + self.num_vars
+        return self.occ_clauses[self.occ_offsets[slot]:self.occ_offsets[slot + 1]].tolist()
+
+    def assignment(self, sol):
+        """
+        :param sol: List of literals
+        :return: bytearray indexed by variable, 1 for positive literal & 0 for negative
+        """
+        value = bytearray(self.num_vars + 1)
+        for literal in sol:
+            if literal > 0:
+                value[literal] = 1
+        return value
+
+    def solution(self, value):
+        """
+        :param value: bytearray indexed by variable
+        :return: List of literals
+        """
+        return [var if value[var] else -var for var in range(1, self.num_vars + 1)]
@@ -0,0 +1,38 @@
+import random as rand
+
+
+def uniform_3sat(num_vars, ratio=4.26, seed=0, planted=False):
+    """
+    Uniform random 3-SAT (as in SATLIB uf instances): each clause has 3 distinct variables & random signs.
+    :param num_vars: No. of variables
+    :param ratio: Clauses / variables, 4.26 is the hardest region
+    :param seed: Random seed, same seed gives the same instance
+    :param planted: If True, clauses violated by a hidden random solution are redrawn, so the instance is satisfiable
+    :return: 2D List of clauses
+    """
+    rng = rand.Random(seed)
+    num_clauses = int(round(ratio * num_vars))
+    hidden = [rng.random() < 0.5 for _ in range(num_vars + 1)]
+    clauses = []
+    while len(clauses) < num_clauses:
+        clause_i = [var if rng.random() < 0.5 else -var for var in rng.sample(range(1, num_vars + 1), 3)]
+        if planted and not any((literal > 0) == hidden[abs(literal)] for literal in clause_i):
+            continue
+        clauses.append(clause_i)
+    return clauses
+
+
+def write_dimacs(fName, clauses, num_vars, comment=None):
+    """
+    Writes clauses as a DIMACS CNF file
+    :param fName: Path of file
+    :param clauses: 2D List of clauses
+    :param num_vars: No. of variables
+    :param comment: Optional comment line
+    """
+    with open(fName, 'w') as file:
+        if comment:
+            file.write("c " + comment + "\n")
+        file.write("p cnf " + str(num_vars) + " " + str(len(clauses)) + "\n")
+        for clause_i in clauses:
+            file.write(" ".join(str(literal) for literal in clause_i) + " 0\n")
@@ -0,0 +1,149 @@
+from .adaptive import AdaptiveNoise
+from .restarts import FIXED, RestartSchedule, initial_assignment
+from .rng import RandomStream
+from .scores import BUCKET_VARS, BucketScores, IncrementalScores, WeightedBucketScores, WeightedScores
+from .stats import STOP_CHECK, BestAssignment, deadline_after, report_run, stop_reason
+
+
+def RandomWalk(scores, rng):
+    """
+    We randomly select clause from unsat clauses
+    We randomly select a var to be flipped from this unsat clause
+    :param scores: IncrementalScores of the current solution
+    :param rng: RandomStream of the run
+    :return: variable to be flipped
+    """
+    rand_unsat_clause = scores.formula.clause(scores.unsat.random_item(rng))  # Unsat clause selection
+    rand_var = rng.choice(rand_unsat_clause)  # Variable selection from chosen unsat clause
+    return abs(rand_var)
+
+
+def GSAT(scores, rng):
+    """
+    This function performs GSAT.
+    Net gain of each variable is read from the maintained make/break counts, so no clause is re-checked here.
+    With gain buckets (BucketScores) the best variable is picked from the best bucket, without scanning them all.
+    :param scores: IncrementalScores of the current solution
+    :param rng: RandomStream of the run
+    :return: variable to be flipped
+    """
+    if scores.buckets is not None:
+        return scores.buckets.random_best(rng)  # Random one of the variables with max net gain
+    make = scores.make
+    brk = scores.brk
+    # Net gain(b0-b1) for each variable
+    net_gain_dic = {var: make[var] - brk[var] for var in range(1, scores.formula.num_vars + 1)}
+    # Find the one with max net gain
+    var_max_value = max(net_gain_dic.values())
+    # Check if there are multiple variable with max net-gain and choose one randomly from them (breaking ties)
+    var_max_net = rng.choice([k for k, v in net_gain_dic.items() if v == var_max_value])
+    # Return the var to be flipped
+    return var_max_net
+
+
+def GWSAT(restart, iterations, variables, formula, wp, stop=None, stats=None, monitor=None,
+          max_flips=None, time_limit=None, restart_policy=FIXED, phase_saving=None,
+          clause_weighting=False, warm_start=None, gain_buckets=None, rng=None):
+    """
+    This fuction is ure pure GWSAT, with restarts, iterations, wp calculation & random_initlization.
+    :param restart: #Restarts given by user
+    :param iterations: #iterations given by user
+    :param variables: # List of variables involved in all clauses
+    :param formula: Formula of all clauses
+    :param wp: walk probability, or ADAPTIVE to adapt it to search progress (AdaptiveNoise)
+    :param stop: Optional Event, search gives up & returns -1 once it is set (e.g. another portfolio member won)
+    :param stats: Optional dictionary, filled by report_run(): flips over all restarts, status, best_unsat & best
+                  (assignment with fewest unsat clauses seen, an anytime answer when no solution is found)
+    :param monitor: Optional SearchMonitor (move counters, init/pick/flip timers, best unsat trace)
+    :param max_flips: Optional flip budget over all restarts
+    :param time_limit: Optional wall-clock budget (seconds) over all restarts
+    :param restart_policy: How long each restart runs, one of RESTART_POLICIES (FIXED: #iterations each)
+    :param phase_saving: Optional share of variables perturbed when restarting from the best assignment seen,
+                         instead of a fresh random one
+    :param warm_start: Optional List of literals the first restart starts from instead of a random assignment,
+                       e.g. the model of a nearly identical formula, so only the clauses it violates get repaired
+    :param clause_weighting: Score flips by clause weights (WeightedScores), at a local minimum of the weighted score
+                             the weights of the unsat clauses are bumped instead of flipping
+    :param gain_buckets: Keep variables in buckets by net gain (BucketScores), so a GSAT step doesn't scan all
+                         variables. None uses them from BUCKET_VARS variables on.
+    :param rng: RandomStream this run draws every random number from, one seeded from the global random module if None
+    :return: Solution List if solution found else -1
+    """
+    deadline = deadline_after(time_limit)
+    rng = RandomStream() if rng is None else rng
+    random = rng.random
+    best = BestAssignment(formula.num_vars)
+    if gain_buckets is None:
+        gain_buckets = formula.num_vars >= BUCKET_VARS
+    if gain_buckets:
+        score_class = WeightedBucketScores if clause_weighting else BucketScores
+    else:
+        score_class = WeightedScores if clause_weighting else IncrementalScores
+    schedule = RestartSchedule(restart_policy, iterations)
+    noise = AdaptiveNoise.for_params(formula, wp)
+    walk_prob = wp if noise is None else noise.wp
+    flips = 0  # Flips made in finished restarts
+    for i in list(range(restart)):
+        if monitor is not None:
+            start = monitor.clock()
+        # Random initial, the warm start on the first restart, or the best so far perturbed with phase saving
+        scores = score_class(formula, initial_assignment(variables, formula, best, rng, phase_saving,
+                                                     warm_start if i == 0 else None))
+        best.restart(scores.value, len(scores.unsat))
+        if noise is not None:
+            noise.restart(len(scores.unsat))
+        if monitor is not None:
+            monitor.add_time("init", start)
+            monitor.restart(len(scores.unsat))
+
+        # Check if solution exist in random initial
+        if len(scores.unsat) == 0:
+            report_run(stats, "solved", flips, formula, best)
+            return scores.solution()
+
+        for j in schedule.steps(len(scores.unsat)):
+            if j % STOP_CHECK == 0:
+                reason = stop_reason(stop, deadline)
+                if reason is not None:
+                    report_run(stats, reason, flips + scores.flips, formula, best)
+                    return -1
+            if max_flips is not None and flips + scores.flips >= max_flips:
+                report_run(stats, "flip_budget", flips + scores.flips, formula, best)
+                return -1
+            if monitor is not None:
+                start = monitor.clock()
+            # Decide to do Random Walk or GSAT based on wp
+            if random() < walk_prob:
+                flip_var = RandomWalk(scores, rng)  # Get var to be flipped
+                move = "random_walk"
+            else:
+                flip_var = GSAT(scores, rng)  # Get var to be flipped
+                move = "greedy"
+                if clause_weighting and scores.gain(flip_var) <= 0:  # Local minimum of the weighted score
+                    scores.bump()
+                    flip_var = 0
+            if monitor is not None:
+                monitor.add_time("pick", start)
+                start = monitor.clock()
+            if flip_var:
+                scores.flip(flip_var)  # Flip the variable & update the counts
+                best.flipped(flip_var, len(scores.unsat))
+            if noise is not None:
+                noise.update(len(scores.unsat))
+                walk_prob = noise.wp
+            if monitor is not None:
+                monitor.add_time("flip", start)
+                if flip_var:
+                    monitor.step(move, len(scores.unsat))
+                else:
+                    monitor.count("weight_bumps")
+            # If no unsat clause is left, solution exist, return it
+            if len(scores.unsat) == 0:
+                report_run(stats, "solved", flips + scores.flips, formula, best)
+                return scores.solution()
+            if schedule.patience is not None and schedule.stagnated(len(scores.unsat)):
+                break
+        flips += scores.flips
+    # If solution doesn't exist in any restart, then return -1
+    report_run(stats, "exhausted", flips, formula, best)
+    return -1
@@ -0,0 +1,18 @@
+from random import random
+
+
+def random_initialization(variables, rng=None):
+    """
+    Creates a random solution with 50% probability of each variable to be positive or negative
+    :param variables: List of variables
+    :param rng: RandomStream of the run, the global random module if None
+    :return: A Random Initial list generated
+    """
+    draw = random if rng is None else rng.random
+    rand_initial = []  # List to store literals
+    for i in variables:  # Take each variable
+        if draw() <= 0.5:  # Have 50% probability of being positive or negative
+            rand_initial.append(i)  # Positive if <= 0.5
+        else:
+            rand_initial.append(-i)  # Otherwise, Negative
+    return rand_initial  # Return the Random Initial solution
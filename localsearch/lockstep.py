@@ -0,0 +1,254 @@
+import numpy as np
+
+from .adaptive import ADAPTIVE
+from .stats import STOP_CHECK, deadline_after, stop_reason
+from .vectorized import ClauseMatrix
+
+WALKERS = 32  # Default No. of walkers advanced together
+LOCKSTEP_WP = 0.4  # wp used when ADAPTIVE is asked for, noise isn't adapted per walker
+LOCKSTEP_TL = 5  # tl used when ADAPTIVE is asked for
+_DUMMY_COUNT = 1 << 20  # True count of the padding clause, far from 0, 1 & 2 so it never changes any score
+
+
+class LockstepWalkers:
+    """
+    K independent walks kept as 2D arrays & advanced one flip per step all together, so one step of
+    NumPy operations does the work of K steps of the single walk engines.
+    values: Assignments (K x num_vars + 1), 1 for True, column 0 unused
+    true_count: No. of true literals of each clause per walker (K x m + 1), last column is a padding clause
+    make / brk: Per walker & variable, as in IncrementalScores (K x num_vars + 1)
+    unsat_count: No. of unsat clauses per walker (K)
+    Clause status, make & brk are updated incrementally from the occurrence matrix of the flipped variables.
+    Variable 0 occurs only in the padding clause, so a walker "flipping" 0 stays where it is.
+    """
+
+    def __init__(self, formula, walkers=WALKERS, rng=None):
+        """
+        :param formula: Formula
+        :param walkers: No. of walkers (K)
+        :param rng: numpy Generator, a fresh unseeded one if None
+        """
+        # Repeated literals are dropped & tautologies (always sat) left out, so a variable occurs once per clause
+        clauses = [sorted(set(clause_i)) for clause_i in formula.clauses()]
+        clauses = [clause_i for clause_i in clauses if not any(-literal in clause_i for literal in clause_i)]
+        self.num_vars = formula.num_vars
+        self.num_clauses = len(clauses)
+        self.matrix = ClauseMatrix.from_clauses(clauses + [[]], formula.num_vars)  # Last row: padding clause
+        self.lengths = (~self.matrix.pad).sum(axis=1)
+
+        occurrences = [[] for _ in range(formula.num_vars + 1)]
+        for c_index, clause_i in enumerate(clauses):
+            for literal in clause_i:
+                occurrences[abs(literal)].append((c_index, literal > 0))
+        width = max(1, max(len(occ) for occ in occurrences))
+        self.occ = np.full((formula.num_vars + 1, width), self.num_clauses, dtype=np.int64)
+        self.occ_positive = np.zeros((formula.num_vars + 1, width), dtype=bool)
+        for var, occ in enumerate(occurrences):
+            for k, (c_index, positive) in enumerate(occ):
+                self.occ[var, k] = c_index
+                self.occ_positive[var, k] = positive
+
+        self.walkers = walkers
+        self.rows = np.arange(walkers)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.flips = 0
+        self.randomize()
+
+    def randomize(self):
+        """
+        New random assignment for every walker (a restart) & all counts from scratch
+        """
+        self.values = self.rng.integers(0, 2, size=(self.walkers, self.num_vars + 1), dtype=np.uint8)
+        self.values[:, 0] = 0
+        matrix = self.matrix
+        true_lits = matrix.true_literals(self.values)
+        count = true_lits.sum(axis=-1).astype(np.int32)
+        count[:, -1] = _DUMMY_COUNT
+        self.true_count = count
+        self.unsat_count = (count == 0).sum(axis=1)
+
+        # Flat index walker * (num_vars + 1) + var, so one bincount fills make (or brk) of all walkers
+        size = self.walkers * (self.num_vars + 1)
+        flat = self.rows[:, None, None] * (self.num_vars + 1) + matrix.var[None, :, :]
+        unsat_lits = (count == 0)[:, :, None] & ~matrix.pad[None, :, :]
+        self.make = np.bincount(flat[unsat_lits], minlength=size).reshape(self.walkers, -1)
+        critical_lits = (count == 1)[:, :, None] & true_lits
+        self.brk = np.bincount(flat[critical_lits], minlength=size).reshape(self.walkers, -1)
+        self.make[:, 0] = 0
+        self.brk[:, 0] = 0
+
+    def solution(self, walker):
+        """
+        :param walker: Walker index
+        :return: Its assignment as list of literals
+        """
+        value = self.values[walker]
+        return [var if value[var] else -var for var in range(1, self.num_vars + 1)]
+
+    def random_unsat_clauses(self):
+        """
+        :return: One uniformly chosen unsat clause per walker (K), the padding clause for walkers with none
+        """
+        walker, c_index = np.nonzero(self.true_count == 0)  # Unsat clauses, grouped by walker
+        if len(c_index) == 0:
+            return np.full(self.walkers, self.num_clauses)
+        first = np.cumsum(self.unsat_count) - self.unsat_count  # Where each walker's clauses start
+        pick = first + (self.rng.random(self.walkers) * self.unsat_count).astype(np.int64)
+        return np.where(self.unsat_count > 0, c_index[np.minimum(pick, len(c_index) - 1)], self.num_clauses)
+
+    def flip(self, flip_vars):
+        """
+        Flips one variable per walker & updates the counts of the clauses it occurs in
+        :param flip_vars: Variable per walker (K), 0 for no flip
+        """
+        rows = self.rows
+        matrix = self.matrix
+        make = self.make
+        brk = self.brk
+        self.values[rows, flip_vars] ^= 1
+        self.values[:, 0] = 0
+        self.flips += int(np.count_nonzero(flip_vars))
+
+        clauses = self.occ[flip_vars]  # K x width
+        became_true = self.occ_positive[flip_vars] == self.values[rows, flip_vars].astype(bool)[:, None]
+        old = self.true_count[rows[:, None], clauses]
+        new = old + np.where(became_true, 1, -1)
+        self.true_count[rows[:, None], clauses] = new
+        self.true_count[:, -1] = _DUMMY_COUNT
+
+        now_sat = (old == 0) & (new == 1)  # Flipped variable is its only true literal
+        now_unsat = (old == 1) & (new == 0)
+        self.unsat_count += now_unsat.sum(axis=1) - now_sat.sum(axis=1)
+        brk[rows, flip_vars] += now_sat.sum(axis=1) - now_unsat.sum(axis=1)
+        # Every variable of a clause which became sat (unsat) makes one less (more)
+        for mask, change in ((now_sat, -1), (now_unsat, 1)):
+            walker, k = np.nonzero(mask)
+            np.add.at(make, (walker[:, None], matrix.var[clauses[walker, k]]), change)
+        # 1 --> 2 true literals: old only true literal isn't critical anymore, 2 --> 1: the remaining one becomes it
+        for mask, change in (((old == 1) & (new == 2), -1), ((old == 2) & (new == 1), 1)):
+            walker, k = np.nonzero(mask)
+            c_index = clauses[walker, k]
+            clause_vars = matrix.var[c_index]
+            true_lits = ((self.values[walker[:, None], clause_vars] == 1) == matrix.positive[c_index]) \
+                & ~matrix.pad[c_index] & (clause_vars != flip_vars[walker][:, None])
+            np.add.at(brk, (walker, clause_vars[np.arange(len(walker)), true_lits.argmax(axis=1)]), change)
+        make[:, 0] = 0
+        brk[:, 0] = 0
+
+    def random_walk_vars(self, c_index):
+        """
+        :param c_index: Clause per walker (K)
+        :return: A uniformly chosen variable of each walker's clause (K)
+        """
+        column = (self.rng.random(self.walkers) * self.lengths[c_index]).astype(np.int64)
+        return self.matrix.var[c_index, column]
+
+    def gwsat_step(self, wp):
+        """
+        GWSAT move for every walker: with probability wp a random variable of a random unsat clause,
+        otherwise the variable with the best make - brk (ties broken at random)
+        :param wp: walk probability
+        """
+        gain = (self.make - self.brk) + self.rng.random(self.make.shape)  # Fractions only break ties
+        gain[:, 0] = -np.inf
+        greedy = gain.argmax(axis=1)
+        walk = self.rng.random(self.walkers) < wp
+        if walk.any():
+            greedy = np.where(walk, self.random_walk_vars(self.random_unsat_clauses()), greedy)
+        self.flip(greedy)
+
+    def walksat_step(self, wp, tl, tabu, step):
+        """
+        Tabu WalkSAT move for every walker, as WalkSAT(): in a random unsat clause, among the variables which
+        aren't tabu, a brk 0 variable if there is one, else with probability wp a random one, else the least brk
+        :param wp: walk probability
+        :param tl: Length of tabu
+        :param tabu: Step from which each variable may flip again, per walker (K x num_vars + 1), updated in place
+        :param step: Current step
+        """
+        rows = self.rows
+        c_index = self.random_unsat_clauses()
+        clause_vars = self.matrix.var[c_index]  # K x width
+        allowed = ~self.matrix.pad[c_index] & (tabu[rows[:, None], clause_vars] <= step)
+        brk = self.brk[rows[:, None], clause_vars]
+        noise = self.rng.random(clause_vars.shape)  # Random tie breaking
+        freebie = allowed & (brk == 0)
+        column = np.where(freebie.any(axis=1),
+                          np.where(freebie, noise, -1.0).argmax(axis=1),
+                          np.where(self.rng.random(self.walkers) < wp,
+                                   np.where(allowed, noise, -1.0).argmax(axis=1),
+                                   np.where(allowed, noise - brk, -np.inf).argmax(axis=1)))
+        flip_vars = np.where(allowed.any(axis=1), clause_vars[rows, column], 0)  # All tabu: no flip
+        self.flip(flip_vars)
+        tabu[rows, flip_vars] = step + tl
+
+
+def _lockstep(restart, iterations, formula, wp, tl, walkers, seed, stop, stats, time_limit):
+    wp = LOCKSTEP_WP if wp == ADAPTIVE else wp
+    tl = LOCKSTEP_TL if tl == ADAPTIVE else tl
+    deadline = deadline_after(time_limit)
+    search = LockstepWalkers(formula, walkers, np.random.default_rng(seed))
+    steps = 0
+    status = "exhausted"
+    for i in range(restart):
+        if i > 0:
+            search.randomize()
+        tabu = np.zeros_like(search.values, dtype=np.int64) if tl is not None else None
+        for j in range(iterations + 1):
+            done = np.flatnonzero(search.unsat_count == 0)
+            if len(done):  # First walker (lowest index) with no unsat clause left
+                if stats is not None:
+                    stats.update(flips=search.flips, status="solved", walker=int(done[0]), steps=steps,
+                                 best_unsat=0, best=search.solution(int(done[0])))
+                return search.solution(int(done[0]))
+            if j == iterations:
+                break
+            if j % STOP_CHECK == 0:
+                reason = stop_reason(stop, deadline)
+                if reason is not None:
+                    status = reason
+                    break
+            if tl is None:
+                search.gwsat_step(wp)
+            else:
+                search.walksat_step(wp, tl, tabu, j)
+            steps += 1
+        if status != "exhausted":
+            break
+    if stats is not None:
+        closest = int(search.unsat_count.argmin())  # Walker with fewest unsat clauses now
+        stats.update(flips=search.flips, status=status, walker=None, steps=steps,
+                     best_unsat=int(search.unsat_count[closest]), best=search.solution(closest))
+    return -1
+
+
+def GWSAT_Lockstep(restart, iterations, variables, formula, wp, walkers=WALKERS, seed=None, stop=None, stats=None,
+                   time_limit=None):
+    """
+    GWSAT with walkers independent walks advanced in lockstep (LockstepWalkers), until one of them solves it.
+    :param restart: #Restarts, each one gives every walker a new random assignment
+    :param iterations: #Steps per restart, every step flips one variable of each walker
+    :param variables: List of variables, kept for the same signature as GWSAT (walkers assign all variables)
+    :param formula: Formula of all clauses
+    :param wp: walk probability, ADAPTIVE runs with LOCKSTEP_WP
+    :param walkers: No. of walkers
+    :param seed: Seed of the numpy Generator of all walkers
+    :param stop: Optional Event, search gives up & returns -1 once it is set
+    :param stats: Optional dictionary, filled with flips (all walkers), status, walker (index of the winner),
+                  steps, best_unsat & best (the solution, or when not solved the walker with fewest unsat clauses
+                  at the end)
+    :param time_limit: Optional wall-clock budget (seconds)
+    :return: Solution List of the first walker to satisfy all clauses, else -1
+    """
+    return _lockstep(restart, iterations, formula, wp, None, walkers, seed, stop, stats, time_limit)
+
+
+def WalkSAT_Tabu_Lockstep(restart, iterations, variables, formula, wp, tl, walkers=WALKERS, seed=None, stop=None,
+                          stats=None, time_limit=None):
+    """
+    WalkSAT with Tabu with walkers independent walks advanced in lockstep (LockstepWalkers),
+    each walker with its own tabu list, until one of them solves it.
+    :param tl: Length of tabu, ADAPTIVE runs with LOCKSTEP_TL
+    Other parameters & return as GWSAT_Lockstep
+    """
+    return _lockstep(restart, iterations, formula, wp, tl, walkers, seed, stop, stats, time_limit)
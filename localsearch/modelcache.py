@@ -0,0 +1,106 @@
+import hashlib
+from array import array
+from collections import OrderedDict
+from itertools import islice
+
+CACHE_ENTRIES = 1024  # Default max. No. of models kept
+WARM_CANDIDATES = 8  # Most recent models nearest() compares against a new formula
+
+
+def formula_key(formula):
+    """
+    Content address of a formula: sha256 of its clauses with literals & clauses sorted,
+    so the same formula with clauses or literals in another order has the same key
+    :param formula: Formula
+    :return: Hex digest
+    """
+    clauses = sorted(tuple(sorted(set(clause_i))) for clause_i in formula.clauses())
+    digest = hashlib.sha256(str(formula.num_vars).encode())
+    for clause_i in clauses:
+        digest.update(array('i', clause_i).tobytes())
+        digest.update(b"\0\0\0\0")  # 0 ends a clause, as in DIMACS
+    return digest.hexdigest()
+
+
+def unsat_count(formula, model):
+    """
+    :param formula: Formula
+    :param model: List of literals, variables not in it count as false, ones above formula.num_vars are ignored
+    :return: No. of clauses of formula which model doesn't satisfy
+    """
+    value = formula.assignment([literal for literal in model if abs(literal) <= formula.num_vars])
+    literals = formula.literals
+    offsets = formula.offsets
+    count = 0
+    for c_index in range(formula.num_clauses):
+        for k in range(offsets[c_index], offsets[c_index + 1]):
+            literal = literals[k]
+            if (value[abs(literal)] == 1) == (literal > 0):
+                break
+        else:
+            count += 1
+    return count
+
+
+class ModelCache:
+    """
+    Models of solved formulas by formula_key(), least recently used one evicted once there are max_entries.
+    solve() with params {"cache": ModelCache()} returns a known model straight away, & for a formula it hasn't seen
+    starts the search from the nearest cached model, so only the clauses that model violates need repairing.
+    hits / misses: get() calls which found / didn't find a model
+    """
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        """
+        :param max_entries: Max. No. of models kept
+        """
+        self.max_entries = max_entries
+        self._models = OrderedDict()  # key --> array('i') of literals, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._models)
+
+    def __contains__(self, key):
+        return key in self._models
+
+    def get(self, key):
+        """
+        :param key: formula_key() of a formula
+        :return: Its model as list of literals, None if not cached
+        """
+        model = self._models.get(key)
+        if model is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._models.move_to_end(key)
+        return model.tolist()
+
+    def put(self, key, model):
+        """
+        :param key: formula_key() of a formula
+        :param model: Its model, list of literals
+        """
+        self._models[key] = array('i', model)
+        self._models.move_to_end(key)
+        while len(self._models) > self.max_entries:
+            self._models.popitem(last=False)
+
+    def nearest(self, formula, candidates=WARM_CANDIDATES):
+        """
+        Warm start for a formula which isn't cached, e.g. a cached one with a few clauses added or removed
+        :param formula: Formula
+        :param candidates: No. of most recently used models compared
+        :return: Model (list of literals) of the candidates violating fewest clauses of formula, None if empty
+        """
+        best, best_unsat = None, None
+        for key in list(islice(reversed(self._models), candidates)):
+            model = self._models[key].tolist()
+            unsat = unsat_count(formula, model)
+            if best_unsat is None or unsat < best_unsat:
+                best, best_unsat = model, unsat
+                if unsat == 0:
+                    break
+        return best
@@ -0,0 +1,245 @@
+import gzip
+import hashlib
+import lzma
+import mmap
+import os
+import zlib
+from array import array
+
+from .formula import Formula
+
+CHUNK_SIZE = 1 << 20  # Bytes read from the file at a time
+CACHE_MAGIC = 0x43534C53  # "SLSC", first int of a cache file
+CACHE_VERSION = 3  # 2: repeated literals are dropped from clauses, 3: tautologies are dropped
+
+
+class DimacsError(ValueError):
+    """
+    Raised when a CNF file is not valid DIMACS, or doesn't match its 'p cnf' header.
+    """
+
+
+def open_cnf(fName):
+    """
+    Opens plain, gzip or xz compressed CNF file, found from its first bytes (not the extension)
+    :param fName: Path of CNF file
+    :return: Binary file object
+    """
+    with open(fName, 'rb') as file:
+        magic = file.read(6)
+    if magic[:2] == b'\x1f\x8b':
+        return gzip.open(fName, 'rb')
+    if magic == b'\xfd7zXZ\x00':
+        return lzma.open(fName, 'rb')
+    return open(fName, 'rb')
+
+
+def _parse_header(data):
+    # data: split 'p cnf #variables #clauses' line
+    if len(data) != 4 or data[1] != b'cnf':
+        raise DimacsError("Expected 'p cnf [#variables] [#clauses]', got " + repr(b' '.join(data).decode()))
+    try:
+        tVariables = int(data[2])
+        tClauses = int(data[3])
+    except ValueError:
+        raise DimacsError("Header counts are not integers: " + repr(b' '.join(data).decode()))
+    if tVariables < 0 or tClauses < 0:
+        raise DimacsError("Header counts are negative: " + repr(b' '.join(data).decode()))
+    return tVariables, tClauses
+
+
+def parse_dimacs(fName, chunk_size=CHUNK_SIZE):
+    """
+    Streaming DIMACS parser, reads the file in large chunks straight into flat arrays.
+    :param fName: Path of CNF file (plain, gzip or xz)
+    :param chunk_size: Bytes read at a time
+    :return: Variables (array, in order of first appearance, as readFromFile() gives them)
+             Formula
+    :raises DimacsError: Also for a truncated or corrupt gzip / xz file
+    """
+    with open_cnf(fName) as file:
+        try:
+            return parse_dimacs_stream(file, chunk_size)
+        except (EOFError, lzma.LZMAError, zlib.error) as error:
+            raise DimacsError("Can't decompress " + fName + ": " + str(error))
+
+
+def parse_dimacs_stream(file, chunk_size=CHUNK_SIZE):
+    """
+    parse_dimacs() of an open binary file, e.g. io.BytesIO of a DIMACS payload received over a socket
+    :param file: Binary file object, read to the end (or the SATLIB '%' marker)
+    :param chunk_size: Bytes read at a time
+    :return: Variables (array, in order of first appearance), Formula
+    """
+    tVariables = -1
+    tClauses = -1
+    literals = array('i')
+    offsets = array('i', [0])
+    variables = array('i')
+    tautologies = 0  # Clauses with a literal & its negation, always satisfied, dropped as in Formula.from_clauses()
+    seen = bytearray()  # seen[var] == 1 once var appeared
+    pending = b''  # Incomplete last line of previous chunk
+    finished = False
+
+    while not finished:
+        chunk = file.read(chunk_size)
+        if chunk:
+            data = pending + chunk
+            cut = data.rfind(b'\n') + 1
+            pending = data[cut:]
+            data = data[:cut]
+        else:
+            data = pending
+            finished = True
+        body = []  # Lines with clause data in this chunk
+        for line in data.split(b'\n'):
+            stripped = line.strip()
+            if not stripped:
+                continue
+            first = stripped[:1]
+            if first == b'c':
+                continue
+            if first == b'p':
+                if tVariables != -1:
+                    raise DimacsError("Second 'p' header line")
+                tVariables, tClauses = _parse_header(stripped.split())
+                seen = bytearray(tVariables + 1)
+                continue
+            if first == b'%':  # SATLIB end marker, rest of the file is ignored
+                finished = True
+                break
+            if tVariables == -1:
+                raise DimacsError("Clause data before the 'p cnf' header")
+            body.append(stripped)
+        try:
+            tokens = [int(token) for token in b' '.join(body).split()]
+        except ValueError as error:
+            raise DimacsError("Non integer literal in clause data: " + str(error))
+        for literal in tokens:
+            if literal == 0:
+                start = offsets[-1]
+                if len(literals) - start > 1:
+                    clause = literals[start:]
+                    unique = set(clause)
+                    if any(-literal in unique for literal in clause):
+                        del literals[start:]
+                        tautologies += 1
+                        continue
+                    if len(unique) != len(clause):  # Repeated literal, kept once as in Formula.from_clauses()
+                        del literals[start:]
+                        literals.extend(dict.fromkeys(clause))
+                offsets.append(len(literals))
+                continue
+            var = literal if literal > 0 else -literal
+            if var > tVariables:
+                raise DimacsError("Variable " + str(var) + " is out of range 1.." + str(tVariables))
+            if not seen[var]:
+                seen[var] = 1
+                variables.append(var)
+            literals.append(literal)
+    # Literals after the last 0 don't make a clause, same as readFromFile() always did
+    del literals[offsets[-1]:]
+
+    if tVariables == -1:
+        raise DimacsError("No 'p cnf' header")
+    if tVariables != len(variables):
+        raise DimacsError("Unexpected number of variables in the problem: header says " + str(tVariables)
+                          + ", clauses use " + str(len(variables)))
+    if tClauses != len(offsets) - 1 + tautologies:
+        raise DimacsError("Unexpected number of clauses in the problem: header says " + str(tClauses)
+                          + ", file has " + str(len(offsets) - 1 + tautologies))
+    return variables, Formula(tVariables, literals, offsets)
+
+
+def file_hash(fName):
+    """
+    :param fName: Path of file
+    :return: sha256 hex digest of the file's bytes, used as cache key
+    """
+    digest = hashlib.sha256()
+    with open(fName, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_cache(path, variables, formula):
+    """
+    Writes a binary cache file: flat C ints
+    [magic, version, #variables, #clauses, #literals, len(variables)] variables offsets literals occ_offsets occ_clauses
+    :param path: Cache file path
+    :param variables: Variables in order of first appearance
+    :param formula: Formula
+    """
+    header = array('i', [CACHE_MAGIC, CACHE_VERSION, formula.num_vars, formula.num_clauses,
+                         len(formula.literals), len(variables)])
+    tmp_path = path + '.' + str(os.getpid()) + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        for part in (header, variables, formula.offsets, formula.literals, formula.occ_offsets, formula.occ_clauses):
+            file.write(memoryview(part).cast('B'))
+    os.replace(tmp_path, path)  # Readers never see a half written cache file
+
+
+def load_cache(path):
+    """
+    Memory-maps a cache file written by save_cache(), arrays of the Formula are views on the mapping
+    :param path: Cache file path
+    :return: (Variables list, Formula), or None if it isn't a valid cache file of this version
+    """
+    with open(path, 'rb') as file:
+        try:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            return None
+    ints = memoryview(mapping).cast('i')
+    if len(ints) < 6 or ints[0] != CACHE_MAGIC or ints[1] != CACHE_VERSION:
+        return None
+    num_vars, num_clauses, num_literals, num_variables = ints[2], ints[3], ints[4], ints[5]
+    sizes = [num_variables, num_clauses + 1, num_literals, 2 * num_vars + 2, num_literals]
+    if len(ints) != 6 + sum(sizes):
+        return None
+    parts = []
+    start = 6
+    for size in sizes:
+        parts.append(ints[start:start + size])
+        start += size
+    variables, offsets, literals, occ_offsets, occ_clauses = parts
+    return variables.tolist(), Formula(num_vars, literals, offsets, occ_offsets, occ_clauses)
+
+
+def read_formula(fName, cache_dir=None):
+    """
+    Reads a CNF file, optionally through a binary cache keyed by the file's content hash,
+    so repeated runs over the same benchmark set skip parsing.
+    :param fName: Path of CNF file (plain, gzip or xz)
+    :param cache_dir: Directory of cache files, no caching if None
+    :return: Variables (List, in order of first appearance)
+             Formula
+    """
+    if cache_dir is None:
+        variables, formula = parse_dimacs(fName)
+        return variables.tolist(), formula
+    path = os.path.join(cache_dir, file_hash(fName) + '.cnfbin')
+    if os.path.exists(path):
+        cached = load_cache(path)
+        if cached is not None:
+            return cached
+    variables, formula = parse_dimacs(fName)
+    os.makedirs(cache_dir, exist_ok=True)
+    save_cache(path, variables, formula)
+    return variables.tolist(), formula
+
+
+# sat_sol() & readFromFile() are taken from Dr. Grimes solution for lab - Sat Checker, with some modification to make the
+# code suitable for my usage. And Hence, I changed the names.
+def readFromFile(fName):
+    """
+    Modified version of Dr. Grimes Sat Checker
+    Now a wrapper over parse_dimacs(), raises DimacsError on invalid files
+
+    :param fName: File to be read to get clauses
+    :return: Variables used in all the clauses
+             Clauses: 2D List of clauses read from file
+    """
+    variables, formula = parse_dimacs(fName)
+    return [variables.tolist(), formula.clauses()]
@@ -0,0 +1,42 @@
+import sys
+
+
+def plot_distribution(x, y, title, xlabel, fName=None):
+    """
+    Plots a run time / run length distribution (x --> P(Solve)).
+    matplotlib is imported here, so that only callers which ask for a plot pay for loading it.
+    :param x: Sorted runtimes (or flips) of the solved executions
+    :param y: P(Solve) at each of them
+    :param title: Title of the plot
+    :param xlabel: Label of the x-axis
+    :param fName: Image file to save it to without any display (Agg backend), shown if None
+    """
+    import matplotlib
+    if fName is not None and "matplotlib.pyplot" not in sys.modules:
+        matplotlib.use("Agg")  # Headless, e.g. compute nodes without a display
+    import matplotlib.pyplot as plt
+
+    # Configuring the plot & printing it
+    figure = plt.figure()
+    plt.step(x, y, where="post")
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel("P(Solve)")
+    plt.ylim(0, 1.05)
+    plt.grid(True)
+    if fName is None:
+        plt.show()
+    else:
+        figure.savefig(fName, bbox_inches="tight")
+    plt.close(figure)
+
+
+def plot_rtd(x, y, title, fName=None):
+    """
+    Plots the run time distribution (runtime --> P(Solve)) & shows it, or saves it to fName.
+    :param x: Sorted runtimes of the solved executions
+    :param y: P(Solve) at each runtime
+    :param title: Title of the plot
+    :param fName: Optional image file, nothing is shown then
+    """
+    plot_distribution(x, y, title, "Runtime/Execution (seconds)", fName)
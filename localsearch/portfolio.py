@@ -0,0 +1,59 @@
+import multiprocessing
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .rng import RandomStream
+from .shared import shared_args
+
+# name: label of the configuration, e.g. "GWSAT wp=0.4"
+# solver: Picklable function (GWSAT, WalkSAT_Tabu), accepting stop, stats & rng keyword arguments
+# args: Tuple of arguments for solver
+# seed: Seed of this member's RandomStream
+PortfolioMember = namedtuple("PortfolioMember", ["name", "solver", "args", "seed"])
+PortfolioResult = namedtuple("PortfolioResult", ["name", "seed", "solution", "flips", "time"])
+
+_stop = None  # Event shared by all workers, set by the first member which finds a solution
+
+
+def _init_worker(stop):
+    global _stop
+    _stop = stop
+
+
+def _run_member(member):
+    stats = {}
+    start_process = time.time()
+    sol = member.solver(*member.args, stop=_stop, stats=stats, rng=RandomStream(member.seed))
+    end_process = time.time()
+    if sol != -1:
+        _stop.set()  # Every other member gives up at its next check
+    return PortfolioResult(member.name, member.seed, sol, stats.get("flips", 0), end_process - start_process)
+
+
+def run_portfolio(members, workers=None):
+    """
+    Races all members in worker processes and stops every one of them as soon as one finds a solution.
+    :param members: List of PortfolioMember
+    :param workers: #Worker processes, None uses all cores. Members which don't fit wait for a free worker.
+    :return: PortfolioResult of the winner (configuration, seed, solution, flips, time) or None if no one
+             found a solution within its restarts & iterations
+    """
+    stop = multiprocessing.Event()
+    winner = None
+    # Members racing on the same formula share one read-only mapping of it, only their walks are private
+    with shared_args(*(member.args for member in members)) as member_args, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stop,)) as pool:
+        pending = {pool.submit(_run_member, member._replace(args=args))
+                   for member, args in zip(members, member_args)}
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result.solution != -1 and winner is None:
+                    winner = result
+        # Members still running stop at their next check, the ones still waiting never start
+        stop.set()
+        for future in pending:
+            future.cancel()
+    return winner
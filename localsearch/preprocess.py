@@ -0,0 +1,166 @@
+from collections import Counter
+
+from .formula import Formula
+
+
+class Simplification:
+    """
+    Result of preprocess(): reduced formula over renumbered variables, plus what is needed to map
+    a model of it back to the original variables.
+    clauses: 2D List of reduced clauses, variables renumbered 1..num_vars
+    var_map: var_map[new variable] = original variable (index 0 unused)
+    fixed: Dictionary of original variable --> 1/0, set by unit propagation & pure literal elimination
+    unsat: True if unit propagation found a conflict, i.e. the formula has no solution
+    stats: Counter of what was removed (tautologies, duplicates, units, pure, subsumed)
+    """
+
+    def __init__(self, clauses, num_vars, var_map, fixed, original_vars, unsat, stats):
+        self.clauses = clauses
+        self.num_vars = num_vars
+        self.var_map = var_map
+        self.fixed = fixed
+        self.original_vars = original_vars
+        self.unsat = unsat
+        self.stats = stats
+
+    def formula(self):
+        """
+        :return: Formula of the reduced clauses
+        """
+        return Formula.from_clauses(self.clauses, self.num_vars)
+
+    def variables(self):
+        """
+        :return: List of variables of the reduced formula
+        """
+        return list(range(1, self.num_vars + 1))
+
+    def extend(self, sol):
+        """
+        Maps a model of the reduced formula back to the original variables.
+        Variables which neither got fixed nor remain in the reduced formula are free, they are set positive.
+        :param sol: List of literals over the reduced variables
+        :return: List of literals over all original variables
+        """
+        value = dict(self.fixed)
+        for literal in sol:
+            value[self.var_map[abs(literal)]] = 1 if literal > 0 else 0
+        return [var if value.get(var, 1) else -var for var in range(1, self.original_vars + 1)]
+
+    def reduce(self, sol):
+        """
+        Maps an assignment of the original variables to the reduced ones (the other way round from extend()),
+        e.g. for a warm start. Reduced variables whose original one isn't in sol are left out.
+        :param sol: List of literals over the original variables
+        :return: List of literals over the reduced variables
+        """
+        value = {abs(literal): literal > 0 for literal in sol}
+        return [var if value[self.var_map[var]] else -var for var in range(1, self.num_vars + 1)
+                if self.var_map[var] in value]
+
+
+def preprocess(clauses, num_vars, subsumption=False):
+    """
+    Simplifies clauses before local search, so that every later flip & check works on a smaller formula:
+    tautology & duplicate removal, unit propagation, pure literal elimination & optionally subsumption.
+    Units & pure literals are propagated through occurrence lists with a work list, so it is linear in formula size
+    (subsumption is not, it is off by default).
+    :param clauses: 2D List of clauses
+    :param num_vars: No. of variables
+    :param subsumption: Also remove clauses which are a superset of another clause
+    :return: Simplification
+    """
+    stats = Counter()
+
+    # Tautologies (var & -var in the same clause) are always sat, repeated literals & clauses add nothing
+    unique = {}
+    for clause_i in clauses:
+        literals = frozenset(clause_i)
+        if any(-literal in literals for literal in literals):
+            stats["tautologies"] += 1
+            continue
+        if literals in unique:
+            stats["duplicates"] += 1
+            continue
+        unique[literals] = None
+    work = [set(literals) for literals in unique]
+
+    alive = [True] * len(work)
+    occurrences = {}
+    count = Counter()  # literal --> No. of alive clauses containing it
+    for c_index, literals in enumerate(work):
+        for literal in literals:
+            occurrences.setdefault(literal, []).append(c_index)
+            count[literal] += 1
+
+    fixed = {}
+    units = [c_index for c_index, literals in enumerate(work) if len(literals) == 1]
+    pure = [literal for literal in count if count[-literal] == 0]
+    unsat = any(len(literals) == 0 for literals in work)
+
+    def kill(c_index):
+        # Clause is sat (or subsumed): its literals occur once less, their negations may become pure
+        alive[c_index] = False
+        for literal in work[c_index]:
+            count[literal] -= 1
+            if count[literal] == 0 and count[-literal] > 0:
+                pure.append(-literal)
+
+    def assign(literal):
+        # literal becomes true: its clauses are sat, -literal is removed from the others
+        fixed[abs(literal)] = 1 if literal > 0 else 0
+        for c_index in occurrences.get(literal, ()):
+            if alive[c_index]:
+                kill(c_index)
+        for c_index in occurrences.get(-literal, ()):
+            if alive[c_index]:
+                work[c_index].discard(-literal)
+                count[-literal] -= 1
+                if len(work[c_index]) == 1:
+                    units.append(c_index)
+                elif len(work[c_index]) == 0:
+                    return False  # Conflict
+        return True
+
+    def propagate():
+        # Units first (they can conflict), then pure literals, until neither is left. True on conflict
+        while units or pure:
+            if units:
+                c_index = units.pop()
+                if not alive[c_index] or len(work[c_index]) != 1:
+                    continue
+                stats["units"] += 1
+                if not assign(next(iter(work[c_index]))):
+                    return True
+            else:
+                literal = pure.pop()
+                if abs(literal) in fixed or count[literal] == 0 or count[-literal] != 0:
+                    continue
+                stats["pure"] += 1
+                assign(literal)
+        return False
+
+    if not unsat:
+        unsat = propagate()
+    if subsumption and not unsat:
+        # Smaller clauses first, candidates are found through the least frequent literal of the clause
+        order = sorted((c_index for c_index in range(len(work)) if alive[c_index]), key=lambda c: len(work[c]))
+        for c_index in order:
+            if not alive[c_index]:
+                continue
+            literals = work[c_index]
+            rarest = min(literals, key=lambda literal: count[literal])
+            for other in occurrences.get(rarest, ()):
+                if other != c_index and alive[other] and len(work[other]) >= len(literals) \
+                        and literals <= work[other]:
+                    kill(other)
+                    stats["subsumed"] += 1
+        unsat = propagate()
+
+    # Renumber the variables which are still in the formula, so the reduced Formula stays compact
+    remaining = sorted({abs(literal) for c_index, literals in enumerate(work) if alive[c_index]
+                        for literal in literals})
+    new_var = {var: new for new, var in enumerate(remaining, 1)}
+    reduced = [[new_var[abs(literal)] * (1 if literal > 0 else -1) for literal in sorted(literals, key=abs)]
+               for c_index, literals in enumerate(work) if alive[c_index]]
+    return Simplification(reduced, len(remaining), [0] + remaining, fixed, num_vars, unsat, stats)
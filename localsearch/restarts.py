@@ -0,0 +1,111 @@
+from itertools import count
+from .initialization import random_initialization
+
+FIXED = "fixed"  # Every restart gets #iterations flips (the original restart x iterations grid)
+LUBY = "luby"  # Restart i gets #iterations * luby(i) flips: 1, 1, 2, 1, 1, 2, 4, 1, ...
+GEOMETRIC = "geometric"  # Restart i gets #iterations * GEOMETRIC_FACTOR ** (i - 1) flips
+STAGNATION = "stagnation"  # A restart goes on until #unsat hasn't improved for #iterations flips
+RESTART_POLICIES = (FIXED, LUBY, GEOMETRIC, STAGNATION)
+GEOMETRIC_FACTOR = 1.5
+PHASE_SAVING = 0.1  # Suggested share of variables flipped when restarting from the best assignment
+
+
+def luby(i):
+    """
+    :param i: Position in the Luby sequence, starting at 1
+    :return: i-th element of 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ...
+    """
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while (1 << k) - 1 != i:  # i is in the repeated prefix, look it up there
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+class RestartSchedule:
+    """
+    How many flips each restart of a run gets, following one of RESTART_POLICIES.
+    Luby & geometric schedules keep some restarts short (cheap escapes from bad starts) while letting others run
+    long, so heavy-tailed run-times waste less of the budget than with one fixed cutoff.
+    """
+
+    def __init__(self, policy, iterations, factor=GEOMETRIC_FACTOR):
+        """
+        :param policy: One of RESTART_POLICIES
+        :param iterations: Base cutoff (FIXED, LUBY, GEOMETRIC) or patience (STAGNATION) in flips
+        :param factor: Growth of GEOMETRIC cutoffs
+        """
+        if policy not in RESTART_POLICIES:
+            raise ValueError("Unknown restart policy " + repr(policy) + ", expected one of " + str(RESTART_POLICIES))
+        self.policy = policy
+        self.iterations = iterations
+        self.factor = factor
+        self.patience = iterations if policy == STAGNATION else None  # None: no stagnated() checks needed
+        self.restarts = 0
+        self._best_unsat = None  # Fewest #unsat of this restart
+        self._since = 0  # Flips since it improved
+
+    def steps(self, unsat):
+        """
+        Starts the next restart
+        :param unsat: #Unsat clauses of its initial assignment
+        :return: Iterable of iteration numbers of this restart
+        """
+        self.restarts += 1
+        self._best_unsat = unsat
+        self._since = 0
+        if self.policy == FIXED:
+            return range(self.iterations)
+        if self.policy == LUBY:
+            return range(self.iterations * luby(self.restarts))
+        if self.policy == GEOMETRIC:
+            return range(int(self.iterations * self.factor ** (self.restarts - 1)))
+        return count()  # STAGNATION, ended by stagnated()
+
+    def stagnated(self, unsat):
+        """
+        Called after each flip when patience is set
+        :param unsat: #Unsat clauses after the flip
+        :return: True if this restart should end
+        """
+        if unsat < self._best_unsat:
+            self._best_unsat = unsat
+            self._since = 0
+            return False
+        self._since += 1
+        return self._since >= self.patience
+
+
+def initial_assignment(variables, formula, best, rng, phase_saving=None, warm_start=None):
+    """
+    Assignment a restart starts from
+    :param variables: List of variables
+    :param formula: Formula
+    :param best: BestAssignment of the run
+    :param rng: RandomStream of the run
+    :param phase_saving: None for a random assignment, else the share of variables flipped at random
+                         in the best assignment seen so far (random on the first restart)
+    :param warm_start: Optional List of literals to start from instead (e.g. a model of a similar formula),
+                       variables it doesn't cover are random & ones above formula.num_vars are ignored
+    :return: bytearray indexed by variable
+    """
+    if warm_start is not None:
+        value = formula.assignment(random_initialization(variables, rng))
+        for literal in warm_start:
+            var = abs(literal)
+            if var <= formula.num_vars:
+                value[var] = 1 if literal > 0 else 0
+        return value
+    saved = None if phase_saving is None else best.best()
+    if saved is None:
+        return formula.assignment(random_initialization(variables, rng))
+    value = saved[:]
+    draw = rng.random
+    for var in variables:
+        if draw() < phase_saving:
+            value[var] ^= 1
+    return value
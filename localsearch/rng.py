@@ -0,0 +1,51 @@
+import hashlib
+import random as rand
+
+
+def derive_seed(seed, *key):
+    """
+    Seed of the stream at spawn key below seed (as NumPy's SeedSequence.spawn), hashed so that streams of
+    neighbouring seeds or keys are unrelated
+    :param seed: Root seed, e.g. 183770 + full_exe*1000
+    :param key: Spawn key, e.g. (walker,)
+    :return: 64-bit integer seed
+    """
+    text = repr((seed,) + tuple(key)).encode()
+    return int.from_bytes(hashlib.sha256(text).digest()[:8], "little")
+
+
+class RandomStream:
+    """
+    Random numbers owned by one solver run (walker), independent of the global random module & of every other
+    stream, so runs in threads or other processes don't share state & a run gives the same result wherever it runs.
+    Floats come from a random.Random of the derived seed; random is its bound random method, a single C call in the
+    hot loop instead of a module-level lookup & a method call per number. Picklable, the state goes with it.
+    seed: Root seed, key: Spawn key below it
+    random: Function returning the next float in [0, 1)
+    """
+
+    def __init__(self, seed=None, key=()):
+        """
+        :param seed: Root seed, None draws one from the global random module (so code which seeds it stays reproducible)
+        :param key: Spawn key, streams of the same seed & different keys are independent
+        """
+        if seed is None:
+            seed = rand.getrandbits(64)
+        self.seed = seed
+        self.key = tuple(key)
+        self._rng = rand.Random(derive_seed(seed, *self.key))
+        self.random = self._rng.random
+
+    def choice(self, seq):
+        """
+        :param seq: Non-empty sequence
+        :return: Random item of seq
+        """
+        return seq[int(self.random() * len(seq))]
+
+    def spawn(self, index):
+        """
+        :param index: Index of the child, e.g. walker No.
+        :return: Independent child RandomStream (key extended by index)
+        """
+        return RandomStream(self.seed, self.key + (index,))
@@ -0,0 +1,96 @@
+import csv
+import json
+import os
+
+FIELDS = ("execution", "seed", "solved", "cpu_time", "wall_time", "flips", "status")
+
+
+def distribution(executions, measure="cpu_time"):
+    """
+    Empirical run-time (measure cpu_time) or run-length (measure flips) distribution.
+    Failed executions are right-censored samples: they add no point, but still count in the denominator,
+    so the curve ends at the success rate instead of pretending every run solved it.
+    :param executions: List of runner.Execution
+    :param measure: "cpu_time", "wall_time" or "flips"
+    :return: (x, y) lists, x sorted measure of each solved execution & y P(solve) within it
+    """
+    total = len(executions)
+    x = sorted(getattr(execution, measure) for execution in executions if execution.solution != -1)
+    y = [(i + 1) / total for i in range(len(x))]
+    return x, y
+
+
+def rtd(executions):
+    """
+    :param executions: List of runner.Execution
+    :return: (x, y) of the run-time distribution over CPU time (process_time seconds)
+    """
+    return distribution(executions, "cpu_time")
+
+
+def rld(executions):
+    """
+    :param executions: List of runner.Execution
+    :return: (x, y) of the run-length distribution over flips
+    """
+    return distribution(executions, "flips")
+
+
+def rows(executions):
+    """
+    :param executions: List of runner.Execution
+    :return: List of dictionaries with FIELDS, one per execution, failed ones with solved False (censored)
+    """
+    return [{"execution": execution.execution, "seed": execution.seed, "solved": execution.solution != -1,
+             "cpu_time": execution.cpu_time, "wall_time": execution.wall_time, "flips": execution.flips,
+             "status": execution.status} for execution in executions]
+
+
+def write_csv(executions, fName):
+    """
+    :param executions: List of runner.Execution
+    :param fName: CSV file, one row per execution (FIELDS)
+    """
+    with open(fName, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows(executions))
+
+
+def write_json(executions, fName, config=None):
+    """
+    :param executions: List of runner.Execution
+    :param fName: JSON file: config, executions (FIELDS) & both distributions
+    :param config: Optional dictionary describing the runs (instance, algorithm, parameters)
+    """
+    x_time, y_time = rtd(executions)
+    x_flips, y_flips = rld(executions)
+    report = {"config": config or {}, "executions": rows(executions),
+              "rtd": {"cpu_time": x_time, "p_solve": y_time}, "rld": {"flips": x_flips, "p_solve": y_flips}}
+    with open(fName, 'w') as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
+
+
+def export(executions, prefix, title, config=None):
+    """
+    Everything an unattended run needs, without a display: prefix.csv, prefix.json, prefix_rtd.png & prefix_rld.png
+    (directories of prefix are created)
+    :param executions: List of runner.Execution
+    :param prefix: Path prefix of the files
+    :param title: Title of the plots
+    :param config: Optional dictionary describing the runs, stored in the JSON
+    :return: List of files written
+    """
+    from .plotting import plot_distribution  # matplotlib is only loaded here
+
+    directory = os.path.dirname(prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    write_csv(executions, prefix + ".csv")
+    write_json(executions, prefix + ".json", config)
+    x, y = rtd(executions)
+    plot_distribution(x, y, title, "CPU time/Execution (seconds)", prefix + "_rtd.png")
+    x, y = rld(executions)
+    plot_distribution(x, y, title, "Flips/Execution", prefix + "_rld.png")
+    return [prefix + ".csv", prefix + ".json", prefix + "_rtd.png", prefix + "_rld.png"]
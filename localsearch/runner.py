@@ -0,0 +1,67 @@
+import time
+from collections import namedtuple
+
+from .rng import RandomStream
+from .shared import attached, shared_args
+
+SEED = 183770  # Base seed, execution full_exe is seeded with SEED + full_exe*1000
+
+# execution: Execution number, seed: its random seed
+# solution: List of literals, or -1 if not found (the run is then a censored sample of the RTD)
+# cpu_time: time.process_time() seconds of the run, wall_time: time.perf_counter() seconds
+# flips: Flips made over all restarts, status: How the run ended (solved, exhausted, ...)
+Execution = namedtuple("Execution", ["execution", "seed", "solution", "cpu_time", "wall_time", "flips", "status"])
+
+_job = None  # (solver, args) of the executions run by this worker process, only set in pool workers
+
+
+def execution_seed(full_exe):
+    """
+    :param full_exe: Execution number
+    :return: Random seed of that execution
+    """
+    return SEED + full_exe * 1000
+
+
+def _init_worker(solver, args):
+    # Solver & its arguments (formula included) are sent once per worker, not once per execution
+    global _job
+    _job = (solver, attached(args))  # Forked workers get a shared formula's file handle as it is, map it here
+
+
+def _run_execution(full_exe):
+    # Pool worker: job set by _init_worker()
+    return _execute(*_job, full_exe)
+
+
+def _execute(solver, args, full_exe):
+    seed = execution_seed(full_exe)
+    rng = RandomStream(seed)  # Own stream of the execution's seed, same numbers whichever worker or thread runs it
+    stats = {}
+    start_cpu = time.process_time()  # CPU time of this process only, other workers & waiting don't count
+    start_wall = time.perf_counter()
+    sol = solver(*args, stats=stats, rng=rng)
+    wall_time = time.perf_counter() - start_wall
+    cpu_time = time.process_time() - start_cpu
+    return Execution(full_exe, seed, sol, cpu_time, wall_time, stats.get("flips", 0), stats.get("status"))
+
+
+def run_executions(solver, args, executions, workers=1):
+    """
+    Runs independent seeded executions of solver, spread over a process pool.
+    :param solver: Picklable function (e.g. GWSAT) accepting stats= & rng= (RandomStream), returns solution list or -1
+    :param args: Tuple of arguments for solver
+    :param executions: #Executions
+    :param workers: #Worker processes, 1 runs executions one after another in this process,
+                    None uses all cores
+    :return: List of Execution (execution, seed, solution or -1, cpu_time, wall_time, flips, status)
+             in execution order, failed executions included
+    """
+    if workers == 1:
+        # Not through _job, so runs in several threads of this process don't share a job
+        return [_execute(solver, args, full_exe) for full_exe in range(executions)]
+    from concurrent.futures import ProcessPoolExecutor  # Only loaded when a pool is asked for
+    # The formula is written once to shared memory, workers map it read-only instead of each unpickling a copy
+    with shared_args(args) as (args,):
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(solver, args)) as pool:
+            return list(pool.map(_run_execution, range(executions)))
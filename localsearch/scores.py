@@ -0,0 +1,359 @@
+from array import array
+
+SMOOTH_EVERY = 10  # WeightedScores smooths the clause weights once every SMOOTH_EVERY bumps
+BUCKET_VARS = 1000  # GWSAT keeps variables in gain buckets (BucketScores) from this #variables on
+
+
+class IndexedSet:
+    """
+    Set of clause indices with O(1) add, remove & random pick.
+    Items are kept in a list, and position of each item in that list is kept in an array,
+    so removal just moves the last item into the place of the removed one.
+    """
+
+    def __init__(self, capacity):
+        """
+        :param capacity: Items are 0..capacity-1
+        """
+        self.items = []
+        self.pos = array('i', [-1]) * capacity
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return self.pos[item] != -1
+
+    def add(self, item):
+        if self.pos[item] == -1:
+            self.pos[item] = len(self.items)
+            self.items.append(item)
+
+    def remove(self, item):
+        pos = self.pos[item]
+        self.pos[item] = -1
+        last = self.items.pop()
+        if last != item:
+            self.items[pos] = last
+            self.pos[last] = pos
+
+    def random_item(self, rng):
+        """
+        :param rng: RandomStream of the run
+        :return: Random item
+        """
+        return rng.choice(self.items)
+
+
+class IncrementalScores:
+    """
+    Keeps the state of the current solution up to date across flips, instead of re-checking all clauses.
+    value: Current assignment, bytearray indexed by variable
+    true_count: No. of true literals in each clause
+    make: For each variable, No. of unsat clauses which become sat if it is flipped
+    brk: For each variable, No. of sat clauses which become unsat if it is flipped (it is their only true literal)
+    unsat: IndexedSet of unsat clause indices
+    flips: No. of flips made so far
+    weight: Weight of each clause, make & brk count a clause by its weight, all 1 unless raised by WeightedScores
+    Net gain of flipping var (b0 - b1 in GSAT) is make[var] - brk[var].
+    buckets: GainBuckets of the variables by net gain, only kept by BucketScores
+    """
+
+    buckets = None
+
+    def __init__(self, formula, value):
+        """
+        :param formula: Formula
+        :param value: Initial assignment (bytearray indexed by variable), it is updated in place by flip()
+        """
+        self.formula = formula
+        self.value = value
+        self.weight = array('i', [1]) * formula.num_clauses
+        self.true_count = array('i', [0]) * formula.num_clauses
+        self.make = array('i', [0]) * (formula.num_vars + 1)
+        self.brk = array('i', [0]) * (formula.num_vars + 1)
+        self.unsat = IndexedSet(formula.num_clauses)
+        self.flips = 0
+
+        literals = formula.literals
+        offsets = formula.offsets
+        for c_index in range(formula.num_clauses):
+            count = 0
+            true_var = 0
+            for k in range(offsets[c_index], offsets[c_index + 1]):
+                literal = literals[k]
+                if (value[abs(literal)] == 1) == (literal > 0):
+                    count += 1
+                    true_var = abs(literal)
+            self.true_count[c_index] = count
+            if count == 0:
+                self.unsat.add(c_index)
+                for k in range(offsets[c_index], offsets[c_index + 1]):
+                    self.make[abs(literals[k])] += 1
+            elif count == 1:
+                self.brk[true_var] += 1
+
+    def gain(self, var):
+        """
+        :param var: Variable
+        :return: Net gain (decrease in #unsat clauses) if var is flipped
+        """
+        return self.make[var] - self.brk[var]
+
+    def _true_var(self, c_index, skip_var):
+        # Variable of the true literal in clause, other than skip_var
+        literals = self.formula.literals
+        value = self.value
+        for k in range(self.formula.offsets[c_index], self.formula.offsets[c_index + 1]):
+            literal = literals[k]
+            var = abs(literal)
+            if var != skip_var and (value[var] == 1) == (literal > 0):
+                return var
+        return 0
+
+    def flip(self, var):
+        """
+        Flips var & updates the counts only for the clauses where var occurs (by clause weight)
+        :param var: Variable to be flipped
+        """
+        formula = self.formula
+        literals = formula.literals
+        offsets = formula.offsets
+        occ_offsets = formula.occ_offsets
+        occ_clauses = formula.occ_clauses
+        true_count = self.true_count
+        weight = self.weight
+        make = self.make
+        brk = self.brk
+
+        was_true = var if self.value[var] == 1 else -var  # Literal which becomes false
+        now_true = -was_true  # Literal which becomes true
+        self.value[var] ^= 1
+        self.flips += 1
+
+        slot = now_true + formula.num_vars
+        for k in range(occ_offsets[slot], occ_offsets[slot + 1]):
+            c_index = occ_clauses[k]
+            count = true_count[c_index]
+            if count == 0:  # Clause becomes sat, var is its only true literal
+                clause_weight = weight[c_index]
+                self.unsat.remove(c_index)
+                for j in range(offsets[c_index], offsets[c_index + 1]):
+                    make[abs(literals[j])] -= clause_weight
+                brk[var] += clause_weight
+            elif count == 1:  # Old only true literal is not critical anymore
+                brk[self._true_var(c_index, var)] -= weight[c_index]
+            true_count[c_index] = count + 1
+
+        slot = was_true + formula.num_vars
+        for k in range(occ_offsets[slot], occ_offsets[slot + 1]):
+            c_index = occ_clauses[k]
+            count = true_count[c_index]
+            if count == 1:  # Clause becomes unsat
+                clause_weight = weight[c_index]
+                self.unsat.add(c_index)
+                for j in range(offsets[c_index], offsets[c_index + 1]):
+                    make[abs(literals[j])] += clause_weight
+                brk[var] -= clause_weight
+            elif count == 2:  # Remaining true literal becomes critical
+                brk[self._true_var(c_index, var)] += weight[c_index]
+            true_count[c_index] = count - 1
+
+    def solution(self):
+        """
+        :return: Current solution as list of literals
+        """
+        return self.formula.solution(self.value)
+
+
+class WeightedScores(IncrementalScores):
+    """
+    IncrementalScores with clause weights (PAWS-style clause weighting).
+    make & brk are sums of clause weights instead of clause counts, so make[var] - brk[var] is the weighted gain
+    which GSAT picks by. All weights start at 1 (weighted scores == counts), bump() raises the weight of every unsat
+    clause by 1 at a local minimum & every smooth_every bumps all weights above 1 are lowered by 1 again,
+    so clauses which are often unsat at local minima pull the search towards satisfying them.
+    The flips are IncrementalScores.flip(), which already counts each clause by its weight.
+    bumps: No. of bump() calls so far
+    """
+
+    def __init__(self, formula, value, smooth_every=SMOOTH_EVERY):
+        """
+        :param formula: Formula
+        :param value: Initial assignment (bytearray indexed by variable), it is updated in place by flip()
+        :param smooth_every: Weights are smoothed once every smooth_every bumps
+        """
+        self.smooth_every = smooth_every
+        self.bumps = 0
+        super().__init__(formula, value)
+
+    def bump(self):
+        """
+        Local minimum: raises the weight of each unsat clause by 1 (every variable in it makes 1 more),
+        then smooths the weights if it is the smooth_every-th bump
+        """
+        literals = self.formula.literals
+        offsets = self.formula.offsets
+        make = self.make
+        for c_index in self.unsat.items:
+            self.weight[c_index] += 1
+            for j in range(offsets[c_index], offsets[c_index + 1]):
+                make[abs(literals[j])] += 1
+        self.bumps += 1
+        if self.bumps % self.smooth_every == 0:
+            self.smooth()
+
+    def smooth(self):
+        """
+        Lowers every weight above 1 by 1 & takes that off the make / brk it is counted in
+        """
+        literals = self.formula.literals
+        offsets = self.formula.offsets
+        weight = self.weight
+        true_count = self.true_count
+        for c_index in range(self.formula.num_clauses):
+            if weight[c_index] > 1:
+                weight[c_index] -= 1
+                count = true_count[c_index]
+                if count == 0:
+                    for j in range(offsets[c_index], offsets[c_index + 1]):
+                        self.make[abs(literals[j])] -= 1
+                elif count == 1:
+                    self.brk[self._true_var(c_index, 0)] -= 1
+
+
+class GainBuckets:
+    """
+    Variables grouped by net gain (make - brk), so the best one is picked without scanning all variables.
+    Each bucket is a list of the variables with that gain & position of each variable in its bucket is kept in
+    an array (like IndexedSet), so moving a variable to another bucket is O(1). Empty buckets are dropped, top is
+    the best gain & is only looked up again among the buckets (a handful of distinct gains) once its bucket empties.
+    gain: Gain each variable is filed under
+    """
+
+    def __init__(self, make, brk, num_vars):
+        """
+        :param make: make counts of IncrementalScores
+        :param brk: brk counts of IncrementalScores
+        :param num_vars: Variables are 1..num_vars
+        """
+        self.gain = array('i', [0]) * (num_vars + 1)
+        self.pos = array('i', [0]) * (num_vars + 1)
+        self.buckets = {}  # gain --> List of variables
+        for var in range(1, num_vars + 1):
+            gain = make[var] - brk[var]
+            self.gain[var] = gain
+            self._add(var, gain)
+        self.top = max(self.buckets) if self.buckets else 0
+
+    def _add(self, var, gain):
+        bucket = self.buckets.get(gain)
+        if bucket is None:
+            bucket = self.buckets[gain] = []
+        self.pos[var] = len(bucket)
+        bucket.append(var)
+
+    def move(self, var, gain):
+        """
+        :param var: Variable whose net gain changed
+        :param gain: Its new net gain
+        """
+        old_gain = self.gain[var]
+        bucket = self.buckets[old_gain]
+        pos = self.pos[var]
+        last = bucket.pop()
+        if last != var:
+            bucket[pos] = last
+            self.pos[last] = pos
+        elif not bucket:
+            del self.buckets[old_gain]
+        self.gain[var] = gain
+        self._add(var, gain)
+        if gain > self.top or self.top not in self.buckets:
+            self.top = gain if gain > self.top else max(self.buckets)
+
+    def random_best(self, rng):
+        """
+        :param rng: RandomStream of the run
+        :return: Random variable among the ones with the best net gain
+        """
+        return rng.choice(self.buckets[self.top])
+
+
+class BucketScores(IncrementalScores):
+    """
+    IncrementalScores which also keep the variables in GainBuckets, for instances too large to scan every variable
+    at each GSAT step. After a flip only the variables of clauses whose make / brk counts changed are re-filed
+    (clauses whose #true literals went 0 <--> 1 or 1 <--> 2), so a step costs the same whatever the #variables.
+    """
+
+    def __init__(self, formula, value):
+        """
+        :param formula: Formula
+        :param value: Initial assignment (bytearray indexed by variable), it is updated in place by flip()
+        """
+        super().__init__(formula, value)
+        self.buckets = GainBuckets(self.make, self.brk, formula.num_vars)
+
+    def _refile(self, c_indices):
+        # Moves the variables of these clauses whose net gain changed to their new bucket
+        literals = self.formula.literals
+        offsets = self.formula.offsets
+        make = self.make
+        brk = self.brk
+        buckets = self.buckets
+        filed = buckets.gain
+        for c_index in c_indices:
+            for j in range(offsets[c_index], offsets[c_index + 1]):
+                var = abs(literals[j])
+                gain = make[var] - brk[var]
+                if gain != filed[var]:
+                    buckets.move(var, gain)
+
+    def flip(self, var):
+        """
+        Flips var, updates the counts & re-files the variables whose net gain changed
+        :param var: Variable to be flipped
+        """
+        super().flip(var)
+        formula = self.formula
+        occ_offsets = formula.occ_offsets
+        occ_clauses = formula.occ_clauses
+        true_count = self.true_count
+        now_true = var if self.value[var] == 1 else -var
+        changed = []
+        slot = now_true + formula.num_vars
+        for k in range(occ_offsets[slot], occ_offsets[slot + 1]):
+            if true_count[occ_clauses[k]] <= 2:  # Was 0 or 1
+                changed.append(occ_clauses[k])
+        slot = formula.num_vars - now_true
+        for k in range(occ_offsets[slot], occ_offsets[slot + 1]):
+            if true_count[occ_clauses[k]] <= 1:  # Was 1 or 2
+                changed.append(occ_clauses[k])
+        self._refile(changed)  # var itself is in every clause it changed
+
+
+class WeightedBucketScores(BucketScores, WeightedScores):
+    """
+    WeightedScores kept in GainBuckets by weighted net gain (clause weighting on large instances)
+    """
+
+    def bump(self):
+        """
+        Bumps the weights of the unsat clauses (see WeightedScores.bump) & re-files their variables
+        """
+        super().bump()
+        self._refile(self.unsat.items)
+
+    def smooth(self):
+        """
+        Smooths all weights (see WeightedScores.smooth) & re-files every variable whose net gain changed
+        """
+        super().smooth()
+        make = self.make
+        brk = self.brk
+        buckets = self.buckets
+        for var in range(1, self.formula.num_vars + 1):
+            gain = make[var] - brk[var]
+            if gain != buckets.gain[var]:
+                buckets.move(var, gain)
@@ -0,0 +1,296 @@
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .api import solve
+from .parser import DimacsError, parse_dimacs_stream
+
+MAX_ACTIVE = 64  # Requests queued or running at once, each one holds a cancel flag slot
+LINE_LIMIT = 1 << 28  # Longest request line (bytes), DIMACS payloads are sent inline
+LOCAL_PARAMS = ("stop", "monitor", "cache")  # solve() params which are objects, not accepted over the socket
+TIMEOUT_GRACE = 0.5  # Seconds past a request's timeout its run may take to stop & report before the reply goes out
+
+# Protocol: one JSON object per line each way.
+# Request: {"id": any, "dimacs": "p cnf ...", "algorithm": "gwsat", "params": {...}, "timeout": seconds}
+#          {"cancel": id} stops that request of the same connection (status "stopped")
+# Reply: {"id", "status", "solution", "flips", "time", "best_unsat", "best"} or {"id", "error"}
+
+_cancel = None  # Shared cancel flags of the worker processes, one per request slot
+
+
+def _init_worker(cancel):
+    global _cancel
+    _cancel = cancel
+
+
+class _CancelFlag:
+    """
+    stop= for the solvers: Event-like view of one slot of the shared cancel flags
+    """
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def is_set(self):
+        return _cancel[self.slot] != 0
+
+
+def _warm_up():
+    # Makes the pool start its processes, engines are imported by then
+    return os.getpid()
+
+
+def _timed_out():
+    # Reply of a request whose timeout ran out before its run started
+    return {"status": "time_budget", "solution": -1, "flips": 0, "time": 0.0, "best_unsat": None, "best": None}
+
+
+def _solve_payload(slot, dimacs, algorithm, params, deadline=None):
+    # deadline: time.time() the reply is due by, the run gets what is left of it after queueing & parsing
+    try:
+        variables, formula = parse_dimacs_stream(io.BytesIO(dimacs.encode()))
+    except DimacsError as error:
+        return {"error": "Invalid DIMACS: " + str(error)}
+    options = dict(params)
+    options["stop"] = _CancelFlag(slot)
+    if deadline is not None:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return _timed_out()
+        limit = options.get("time_limit")
+        options["time_limit"] = remaining if limit is None else min(limit, remaining)
+    result = solve(formula, algorithm, options)
+    return {"status": result.status, "solution": result.solution, "flips": result.flips, "time": result.time,
+            "best_unsat": result.best_unsat, "best": result.best}
+
+
+class SolverServer:
+    """
+    Long running solver daemon: a pool of warm worker processes with the engines loaded, serving JSON line
+    requests over a Unix-domain socket or localhost TCP, so a request costs no interpreter start or imports.
+    A timeout counts from the request's arrival: waiting for a slot or a worker & parsing use it up, the run gets
+    the rest as its time_limit. Cancel requests set the run's stop flag, so either way the reply still has the best
+    assignment found.
+    """
+
+    def __init__(self, workers=None, max_active=MAX_ACTIVE):
+        """
+        :param workers: #Worker processes, None uses all cores
+        :param max_active: Max. requests queued or running at once, later ones wait for a free slot
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.cancel = multiprocessing.Array('b', max_active, lock=False)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                        initargs=(self.cancel,))
+        self._free = list(range(max_active))  # Free cancel flag slots
+        self._slot_ready = None  # asyncio.Condition, once the loop runs
+        self._active = {}  # (connection, request id) --> slot
+        self._reserved = {}  # (connection, request id) --> cancelled, from arrival until the reply is sent
+        self.server = None
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """
+        Warms up the workers & starts listening
+        :param path: Unix-domain socket path, TCP on host:port if None
+        :param host: TCP host
+        :param port: TCP port, 0 picks a free one
+        :return: Address served (path, or (host, port))
+        """
+        loop = asyncio.get_event_loop()
+        self._slot_ready = asyncio.Condition()
+        await asyncio.gather(*[loop.run_in_executor(self.pool, _warm_up) for _ in range(self.workers)])
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle, path, limit=LINE_LIMIT)
+            return path
+        self.server = await asyncio.start_server(self._handle, host, port, limit=LINE_LIMIT)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for slot in self._active.values():
+            self.cancel[slot] = 1
+        self.pool.shutdown(wait=True)
+
+    async def _acquire(self, key):
+        async with self._slot_ready:
+            while not self._free:
+                await self._slot_ready.wait()
+            slot = self._free.pop()
+        self.cancel[slot] = 0
+        self._active[key] = slot
+        return slot
+
+    async def _release(self, key, slot):
+        if self._active.get(key) == slot:
+            del self._active[key]
+        async with self._slot_ready:
+            self._free.append(slot)
+            self._slot_ready.notify()
+
+    def _cancel_request(self, key):
+        slot = self._active.get(key)
+        if slot is not None:
+            self.cancel[slot] = 1
+        elif key in self._reserved:  # Still waiting for a slot, its flag is set once it gets one
+            self._reserved[key] = True
+
+    async def _handle(self, reader, writer):
+        connection = id(writer)
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):  # ValueError: line longer than LINE_LIMIT
+                    break
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError as error:
+                    self._reply(writer, {"id": None, "error": "Invalid JSON: " + str(error)})
+                    continue
+                if not isinstance(message, dict):
+                    self._reply(writer, {"id": None, "error": "Request must be a JSON object"})
+                    continue
+                if "cancel" in message:
+                    self._cancel_request((connection, json.dumps(message["cancel"])))
+                    continue
+                task = asyncio.ensure_future(self._solve(connection, message, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            # Client went away: stop what it still has running, nobody will read the replies
+            for key in list(self._reserved):
+                if key[0] == connection:
+                    self._cancel_request(key)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+
+    async def _solve(self, connection, message, writer):
+        request_id = message.get("id")
+        params = message.get("params") or {}
+        timeout = message.get("timeout")
+        if not isinstance(params, dict):
+            error = "'params' must be a JSON object"
+        elif timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float))):
+            error = "'timeout' must be a number of seconds"
+        elif "dimacs" not in message:
+            error = "Missing 'dimacs'"
+        else:
+            local = [name for name in LOCAL_PARAMS if name in params]
+            error = "Params can't be sent: " + ", ".join(local) if local else None
+        if error is not None:
+            self._reply(writer, {"id": request_id, "error": error})
+            return
+        deadline = None if timeout is None else time.time() + timeout
+        key = (connection, json.dumps(request_id))  # ids can be any JSON value
+        if key in self._reserved:
+            self._reply(writer, {"id": request_id, "error": "Request id is already in use"})
+            return
+        self._reserved[key] = False  # Before any await, so a second request with this id is refused
+        try:
+            reply = await self._run(key, deadline, message["dimacs"], message.get("algorithm", "gwsat"), params)
+        finally:
+            del self._reserved[key]
+        reply["id"] = request_id
+        self._reply(writer, reply)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _run(self, key, deadline, dimacs, algorithm, params):
+        try:
+            if deadline is None:
+                slot = await self._acquire(key)
+            else:
+                slot = await asyncio.wait_for(self._acquire(key), max(deadline - time.time(), 0))
+        except asyncio.TimeoutError:
+            if key in self._active:  # Got its slot just as the time ran out
+                await self._release(key, self._active[key])
+            async with self._slot_ready:
+                if self._free:  # Pass on a wake-up this request may have taken
+                    self._slot_ready.notify()
+            return _timed_out()
+        if self._reserved[key]:  # Cancelled while waiting
+            self.cancel[slot] = 1
+        future = asyncio.get_event_loop().run_in_executor(
+            self.pool, _solve_payload, slot, dimacs, algorithm, params, deadline)
+        if deadline is not None:
+            await asyncio.wait({future}, timeout=max(deadline - time.time(), 0) + TIMEOUT_GRACE)
+            if not future.done():
+                # Still queued for a worker: it returns at once when one picks it up & frees the slot then
+                self.cancel[slot] = 1
+                future.add_done_callback(lambda done: self._release_later(key, slot, done))
+                return _timed_out()
+        try:
+            return await future
+        except Exception as error:  # e.g. ValueError for an unknown algorithm or parameter
+            return {"error": str(error)}
+        finally:
+            if future.done():
+                await self._release(key, slot)
+
+    def _release_later(self, key, slot, future):
+        # Run of a timed out request finished, nobody waits for its reply
+        if not future.cancelled():
+            future.exception()
+        asyncio.ensure_future(self._release(key, slot))
+
+    @staticmethod
+    def _reply(writer, reply):
+        if not writer.is_closing():
+            writer.write(json.dumps(reply).encode() + b"\n")
+
+
+def serve(path=None, host="127.0.0.1", port=0, workers=None, ready=None):
+    """
+    Runs a SolverServer until interrupted
+    :param path: Unix-domain socket path, TCP on host:port if None
+    :param host: TCP host
+    :param port: TCP port, 0 picks a free one
+    :param workers: #Worker processes, None uses all cores
+    :param ready: Optional function called with the address once requests are accepted
+    """
+    async def run():
+        server = SolverServer(workers)
+        address = await server.start(path, host, port)
+        if ready is not None:
+            ready(address)
+        try:
+            await server.server.serve_forever()
+        finally:
+            await server.close()
+
+    asyncio.run(run())
+
+
+def request(address, dimacs, algorithm="gwsat", params=None, timeout=None):
+    """
+    Blocking client: sends one request to a running server & waits for its reply
+    :param address: Unix-domain socket path, or (host, port)
+    :param dimacs: DIMACS CNF text
+    :param algorithm: "gwsat" or "walksat"
+    :param params: JSON serializable solve() params
+    :param timeout: Seconds the run may take, the reply then has status time_budget & the best assignment
+    :return: Reply dictionary
+    """
+    if isinstance(address, str):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    with client:
+        client.connect(address if isinstance(address, str) else tuple(address))
+        message = {"id": 0, "dimacs": dimacs, "algorithm": algorithm, "params": params or {}, "timeout": timeout}
+        client.sendall(json.dumps(message).encode() + b"\n")
+        with client.makefile('rb') as replies:
+            return json.loads(replies.readline())
@@ -0,0 +1,139 @@
+import os
+import tempfile
+from array import array
+from contextlib import contextmanager
+
+from .formula import Formula
+from .parser import load_cache, save_cache
+
+SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None  # tmpfs, so the mapped file is shared memory
+
+
+def _attach(path):
+    # Unpickling a shared formula in a worker: map the file
+    return SharedFormula.attach(path)
+
+
+class SharedFormula(Formula):
+    """
+    Formula whose flat clause & occurrence arrays are stored once in a memory-mapped file (in /dev/shm where there
+    is one, i.e. shared memory) & read through read-only views on the mapping.
+    Pickling it, e.g. as an argument for worker processes, only sends the file path: every worker maps the same
+    pages instead of unpickling its own copy, so memory doesn't grow with the No. of workers.
+    Only the assignment & scores of each walk (IncrementalScores) are private to a process.
+    The file is written & removed by a SharedFormulaFile, which the workers are given instead of the Formula.
+    """
+
+    path = None
+
+    @classmethod
+    def create(cls, formula, variables=None, directory=SHARED_DIR):
+        """
+        :param formula: Formula to share
+        :param variables: Variables in order of first appearance, 1..num_vars if not given
+        :param directory: Directory of the mapped file, a temporary directory if None
+        :return: SharedFormulaFile, close() it once the workers are done
+        """
+        return SharedFormulaFile(formula, variables, directory)
+
+    @classmethod
+    def attach(cls, path):
+        """
+        :param path: File written by a SharedFormulaFile
+        :return: SharedFormula over the mapped file
+        """
+        variables, formula = load_cache(path)
+        shared = cls(formula.num_vars, formula.literals, formula.offsets, formula.occ_offsets, formula.occ_clauses)
+        shared.path = path
+        return shared
+
+    def __reduce__(self):
+        return _attach, (self.path,)
+
+
+class SharedFormulaFile:
+    """
+    Owner of the file of a SharedFormula. It doesn't map the file itself (so it can be removed on Windows too,
+    once the workers are gone) & is pickled as the path, workers unpickle it as a SharedFormula.
+    """
+
+    def __init__(self, formula, variables=None, directory=SHARED_DIR):
+        """
+        :param formula: Formula to share
+        :param variables: Variables in order of first appearance, 1..num_vars if not given
+        :param directory: Directory of the file, a temporary directory if None
+        """
+        handle, self.path = tempfile.mkstemp(prefix="localsearch-", suffix=".cnfbin", dir=directory)
+        os.close(handle)
+        if variables is None:
+            variables = range(1, formula.num_vars + 1)
+        try:
+            save_cache(self.path, array('i', variables), formula)
+        except BaseException:
+            os.remove(self.path)
+            raise
+
+    def __reduce__(self):
+        return _attach, (self.path,)
+
+    def attach(self):
+        """
+        :return: SharedFormula over the file, for a worker which got this object without pickling (forked)
+        """
+        return SharedFormula.attach(self.path)
+
+    def close(self):
+        """
+        Removes the file. Processes which mapped it keep their mapping until they drop it (on Windows the removal
+        fails while one still has it mapped, so close it after the workers have exited).
+        """
+        if self.path is not None:
+            path, self.path = self.path, None
+            os.remove(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attached(args):
+    """
+    :param args: Worker arguments from shared_args()
+    :return: Tuple of them with every SharedFormulaFile mapped as a SharedFormula
+             (pool initializer arguments reach forked workers without being pickled)
+    """
+    return tuple(arg.attach() if isinstance(arg, SharedFormulaFile) else arg for arg in args)
+
+
+@contextmanager
+def shared_args(*arg_tuples):
+    """
+    Worker arguments with every Formula replaced by a SharedFormulaFile (one per distinct Formula object),
+    removed again on exit
+    :param arg_tuples: Tuples of arguments, e.g. (restart, iterations, variables, formula, wp)
+    :return: List of the tuples, with shared formulas
+    """
+    created = {}  # id(Formula) --> SharedFormulaFile
+    result = []
+    try:
+        for args in arg_tuples:
+            shared = []
+            for arg in args:
+                if isinstance(arg, Formula) and not isinstance(arg, SharedFormula):
+                    if id(arg) not in created:
+                        created[id(arg)] = SharedFormulaFile(arg)
+                    arg = created[id(arg)]
+                shared.append(arg)
+            result.append(tuple(shared))
+        yield result
+    finally:
+        failed = None
+        for shared in created.values():  # Every file is removed even if one removal fails, that one is raised
+            try:
+                shared.close()
+            except OSError as error:
+                failed = failed or error
+        if failed is not None:
+            raise failed
@@ -0,0 +1,201 @@
+import time
+from collections import Counter, defaultdict
+
+STOP_CHECK = 256  # Solvers look at their stop event once every STOP_CHECK iterations
+
+
+def stop_reason(stop, deadline):
+    """
+    Checked by the solvers once every STOP_CHECK iterations
+    :param stop: Optional Event
+    :param deadline: Optional time.perf_counter() value
+    :return: "stopped" if stop is set, "time_budget" if deadline has passed, else None
+    """
+    if stop is not None and stop.is_set():
+        return "stopped"
+    if deadline is not None and time.perf_counter() >= deadline:
+        return "time_budget"
+    return None
+
+
+def deadline_after(time_limit):
+    """
+    :param time_limit: Seconds or None
+    :return: time.perf_counter() value of the deadline, None if no time limit
+    """
+    return None if time_limit is None else time.perf_counter() + time_limit
+
+
+class BestAssignment:
+    """
+    Fewest unsat clauses seen over all restarts of a run & the assignment which had them, for anytime answers.
+    Copying the assignment at every improvement would cost O(n) many times while the search descends, so instead
+    flips since a snapshot of this restart are logged & the best is rebuilt from the snapshot when asked for.
+    The snapshot moves forward once the log is longer than the No. of variables, so it is amortized O(1) per flip.
+    """
+
+    def __init__(self, num_vars):
+        """
+        :param num_vars: No. of variables
+        """
+        self.unsat = None  # Fewest unsat clauses seen
+        self.value = None  # Best assignment, once it is built
+        self._base = None  # Snapshot of an assignment of this restart
+        self._trail = []  # Variables flipped since _base
+        self._best_len = -1  # Best is _base + _trail[:_best_len], -1 if it is in self.value instead
+        self._limit = max(1024, num_vars)
+
+    def restart(self, value, unsat):
+        """
+        :param value: Initial assignment of the new restart
+        :param unsat: Its #unsat clauses
+        """
+        self._build()
+        self._base = value[:]
+        self._trail = []
+        if self.unsat is None or unsat < self.unsat:
+            self.unsat = unsat
+            self._best_len = 0
+
+    def flipped(self, var, unsat):
+        """
+        :param var: Variable just flipped
+        :param unsat: #Unsat clauses after the flip
+        """
+        trail = self._trail
+        trail.append(var)
+        if unsat < self.unsat:
+            self.unsat = unsat
+            self._best_len = len(trail)
+        if len(trail) > self._limit:
+            self._build()
+            base = self._base
+            for flipped_var in trail:
+                base[flipped_var] ^= 1
+            trail.clear()
+
+    def _build(self):
+        # Best of this restart --> self.value
+        if self._best_len >= 0:
+            value = self._base[:]
+            for flipped_var in self._trail[:self._best_len]:
+                value[flipped_var] ^= 1
+            self.value = value
+            self._best_len = -1
+
+    def best(self):
+        """
+        :return: Best assignment seen (bytearray indexed by variable), None before the first restart
+        """
+        self._build()
+        return self.value
+
+
+def report_run(stats, status, flips, formula, best):
+    """
+    Fills the (optional) stats dictionary of a solver run:
+    flips (added up over calls), status (solved, exhausted, flip_budget, time_budget, stopped),
+    best_unsat & best (List of literals with fewest unsat clauses seen, the solution when solved)
+    :param stats: Dictionary or None
+    :param status: How the run ended
+    :param flips: No. of flips made
+    :param formula: Formula
+    :param best: BestAssignment of the run
+    """
+    if stats is not None:
+        stats["flips"] = stats.get("flips", 0) + flips
+        stats["status"] = status
+        value = best.best()
+        if value is not None:
+            stats["best_unsat"] = best.unsat
+            stats["best"] = formula.solution(value)
+
+
+class SearchMonitor:
+    """
+    Optional instrumentation of a search run, passed to the solvers as monitor=.
+    Solvers only touch it when one is given, so the hot loops pay a single 'is None' check when it is disabled.
+    counters: Moves by kind (greedy, random_walk, freebie), tabu_blocked variables, all_tabu steps, restarts,
+              weight_bumps (clause weighting GWSAT)
+    timers: Seconds spent per phase (init, pick, flip), only when timing is on
+    trace: (flip, unsat, best_unsat) sampled every sample_every flips & at each restart
+    """
+
+    def __init__(self, sample_every=1000, callback=None, timing=True):
+        """
+        :param sample_every: Flips between two trace samples
+        :param callback: Optional function(monitor, unsat), called at every sample
+        :param timing: Measure per phase time (costs two clock reads per phase & flip)
+        """
+        self.sample_every = sample_every
+        self.callback = callback
+        self.timing = timing
+        self.counters = Counter()
+        self.timers = defaultdict(float)
+        self.trace = []
+        self.flips = 0
+        self.best_unsat = None
+
+    def clock(self):
+        """
+        :return: Start time for add_time(), 0 when timing is off
+        """
+        return time.perf_counter() if self.timing else 0.0
+
+    def add_time(self, phase, start):
+        """
+        :param phase: Name of phase
+        :param start: Value of clock() when the phase started
+        """
+        if self.timing:
+            self.timers[phase] += time.perf_counter() - start
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def restart(self, unsat):
+        """
+        Called after each random initialization
+        :param unsat: #Unsat clauses of the initial solution
+        """
+        self.counters["restarts"] += 1
+        self._update_best(unsat)
+        self.sample(unsat)
+
+    def step(self, move, unsat):
+        """
+        Called after each flip
+        :param move: Kind of move (greedy, random_walk, freebie)
+        :param unsat: #Unsat clauses after the flip
+        """
+        self.counters[move] += 1
+        self.flips += 1
+        self._update_best(unsat)
+        if self.flips % self.sample_every == 0:
+            self.sample(unsat)
+
+    def _update_best(self, unsat):
+        if self.best_unsat is None or unsat < self.best_unsat:
+            self.best_unsat = unsat
+
+    def sample(self, unsat):
+        self.trace.append((self.flips, unsat, self.best_unsat))
+        if self.callback is not None:
+            self.callback(self, unsat)
+
+    def as_dict(self):
+        """
+        :return: Counters, timers, flips & best unsat, json serializable
+        """
+        return {"flips": self.flips, "best_unsat": self.best_unsat,
+                "counters": dict(self.counters), "timers": dict(self.timers)}
+
+    def write_trace(self, fName):
+        """
+        Writes the trace as CSV (flip,unsat,best_unsat) for offline analysis
+        :param fName: Path of CSV file
+        """
+        with open(fName, 'w') as file:
+            file.write("flip,unsat,best_unsat\n")
+            for flip, unsat, best_unsat in self.trace:
+                file.write(str(flip) + "," + str(unsat) + "," + str(best_unsat) + "\n")
@@ -0,0 +1,323 @@
+import itertools
+import math
+import os
+import random as rand
+import re
+import time
+from collections import OrderedDict
+
+from .api import solve
+from .runner import execution_seed
+
+PAR_FACTOR = 10  # Failed run costs PAR_FACTOR * max_flips (PAR10 on flips)
+MIN_BLOCKS = 5  # Blocks every configuration runs before the first elimination test
+ALPHA = 0.05  # Significance level of the Friedman & post-hoc tests
+BASELINE = {"wp": 0.4, "tl": 5}  # Setting the speedup is measured against (the scripts' usual one)
+FORMULA_CACHE = 32  # Parsed formulas kept per worker process (families are raced one after another)
+
+_formulas = OrderedDict()  # path --> Formula, least recently used first
+
+
+def grid(space):
+    """
+    :param space: Dictionary of parameter --> list of values, e.g. {"wp": [0.2, 0.4], "tl": [3, 5]}
+    :return: List of configurations (dictionaries), every combination of the values
+    """
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def instance_family(path):
+    """
+    Family of a training instance from its file name: the part before the first '-' ("uf50-01.cnf" --> "uf50"),
+    else the name without trailing digits ("flat30_7.cnf" --> "flat30_")
+    :param path: CNF file
+    :return: Family name
+    """
+    name = os.path.basename(path)
+    name = re.sub(r"(\.cnf)?(\.gz|\.xz)?$", "", name)
+    if "-" in name:
+        return name.split("-")[0]
+    return name.rstrip("0123456789") or name
+
+
+# ---------- Friedman test & post-hoc comparisons, as in F-race (Birattari et al.) ----------
+
+def _ranks(row):
+    # Ranks 1..k of the costs in a block, ties get their average rank
+    order = sorted(range(len(row)), key=lambda i: row[i])
+    ranks = [0.0] * len(row)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and row[order[j + 1]] == row[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def _gamma_q(s, x):
+    # Regularized upper incomplete gamma Q(s, x), series for small x & continued fraction otherwise
+    if x <= 0:
+        return 1.0
+    if x < s + 1:
+        term = total = 1.0 / s
+        n = s
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return 1.0 - total * math.exp(-x + s * math.log(x) - math.lgamma(s))
+    b = x + 1 - s
+    c = 1e300
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        a = -i * (i - s)
+        b += 2
+        d = 1 / (a * d + b if abs(a * d + b) > 1e-300 else 1e-300)
+        c = b + a / c if abs(b + a / c) > 1e-300 else 1e-300
+        h *= d * c
+        if abs(d * c - 1) < 1e-15:
+            break
+    return math.exp(-x + s * math.log(x) - math.lgamma(s)) * h
+
+
+def chi2_sf(x, df):
+    """
+    :return: P(X > x) for X chi-squared with df degrees of freedom
+    """
+    return _gamma_q(df / 2, x / 2)
+
+
+def _beta_cf(a, b, x):
+    # Continued fraction of the regularized incomplete beta function (Lentz)
+    c, d = 1.0, 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > 1e-300 else 1e-300)
+    h = d
+    for m in range(1, 1000):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > 1e-300 else 1e-300)
+            c = 1 + numerator / c
+            c = c if abs(c) > 1e-300 else 1e-300
+            h *= d * c
+        if abs(d * c - 1) < 1e-15:
+            break
+    return h
+
+
+def t_cdf(t, df):
+    """
+    :return: P(T <= t) for T Student-t with df degrees of freedom
+    """
+    x = df / (df + t * t)
+    front = math.exp(math.lgamma((df + 1) / 2) - math.lgamma(df / 2) - math.lgamma(0.5)
+                     + (df / 2) * math.log(x) + 0.5 * math.log1p(-x)) if 0 < x < 1 else 0.0
+    if x < (df / 2 + 1) / (df / 2 + 0.5 + 2):
+        tail = front * _beta_cf(df / 2, 0.5, x) / (df / 2)
+    else:
+        tail = 1 - front * _beta_cf(0.5, df / 2, 1 - x) / 0.5 if x < 1 else 1.0
+    return 1 - tail / 2 if t > 0 else tail / 2
+
+
+def t_quantile(p, df):
+    """
+    :return: t with P(T <= t) = p, by bisection
+    """
+    low, high = -1e3, 1e3
+    for _ in range(200):
+        middle = (low + high) / 2
+        if t_cdf(middle, df) < p:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def friedman_survivors(costs, alpha=ALPHA):
+    """
+    One F-race elimination step: Friedman test over the blocks so far, & if the configurations differ
+    significantly, every one whose rank sum is significantly worse than the best one's is dropped
+    :param costs: List of blocks, each a list of the costs of the same k configurations (lower is better)
+    :param alpha: Significance level
+    :return: Indices (0..k-1) of the configurations which stay in the race
+    """
+    n, k = len(costs), len(costs[0])
+    everyone = list(range(k))
+    if k < 2 or n < 2:
+        return everyone
+    ranks = [_ranks(row) for row in costs]
+    rank_sums = [sum(row[j] for row in ranks) for j in range(k)]
+    squares = sum(r * r for row in ranks for r in row)
+    correction = n * k * (k + 1) ** 2 / 4
+    if squares - correction <= 0:  # Every block ranks them all the same: no evidence either way
+        return everyone
+    statistic = (k - 1) * sum((r - n * (k + 1) / 2) ** 2 for r in rank_sums) / (squares - correction)
+    if chi2_sf(statistic, k - 1) >= alpha:
+        return everyone
+    df = (n - 1) * (k - 1)
+    spread = math.sqrt(max(0.0, 2 * n * (squares - correction) * (1 - statistic / (n * (k - 1))) / df))
+    critical = t_quantile(1 - alpha / 2, df) * spread
+    best = min(rank_sums)
+    return [j for j in everyone if rank_sums[j] - best <= critical]
+
+
+# ---------- Evaluation of one configuration on one (instance, seed) block ----------
+
+def run_cost(path, algorithm, config, seed, params):
+    """
+    One run of a configuration
+    :param path: CNF file
+    :param algorithm: "gwsat" or "walksat"
+    :param config: Tuned parameters (wp, tl, ...)
+    :param seed: Random seed of the run
+    :param params: Fixed solve() params (restarts, iterations, max_flips, ...)
+    :return: (cost: flips, or PAR_FACTOR * max_flips if not solved, solved, process_time seconds)
+    """
+    formula = _formulas.get(path)
+    if formula is None:
+        from .api import load_formula
+        formula = _formulas[path] = load_formula(path)[1]
+        if len(_formulas) > FORMULA_CACHE:
+            _formulas.popitem(last=False)
+    else:
+        _formulas.move_to_end(path)
+    options = dict(params)
+    options.update(config)
+    options["seed"] = seed
+    start = time.process_time()
+    result = solve(formula, algorithm, options)
+    cpu_time = time.process_time() - start
+    solved = result.status == "solved"
+    cost = result.flips if solved else PAR_FACTOR * (params.get("max_flips") or result.flips)
+    return cost, solved, cpu_time
+
+
+def _run_job(job):
+    return run_cost(*job)
+
+
+class Tuner:
+    """
+    Racing tuner (F-race style) for wp / tl: per instance family, configurations run block by block
+    (block = one instance & seed), & after MIN_BLOCKS blocks, ones significantly worse than the best are dropped,
+    so the budget goes to the promising ones. Runs of a block are spread over a process pool.
+    """
+
+    def __init__(self, algorithm, configs, params, workers=1, alpha=ALPHA, min_blocks=MIN_BLOCKS):
+        """
+        :param algorithm: "gwsat" or "walksat"
+        :param configs: List of configurations, e.g. grid({"wp": [...], "tl": [...]})
+        :param params: Fixed solve() params, max_flips should be set (cost of a failed run is based on it)
+        :param workers: #Worker processes, 1 runs everything in this process
+        :param alpha: Significance level of the elimination tests
+        :param min_blocks: Blocks before the first elimination test
+        """
+        self.algorithm = algorithm
+        self.configs = configs
+        self.params = params
+        self.workers = workers
+        self.alpha = alpha
+        self.min_blocks = min_blocks
+        self._pool = None
+
+    def __enter__(self):
+        if self.workers != 1:
+            from concurrent.futures import ProcessPoolExecutor  # Only loaded when a pool is asked for
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _evaluate(self, jobs):
+        jobs = [(path, self.algorithm, config, seed, self.params) for path, config, seed in jobs]
+        if self._pool is None:
+            return [_run_job(job) for job in jobs]
+        return list(self._pool.map(_run_job, jobs))
+
+    def race(self, blocks, baseline=None):
+        """
+        Races all configurations over the blocks of one family
+        :param blocks: List of (path, seed)
+        :param baseline: Configuration the speedup is measured against
+        :return: Dictionary: best config, its mean cost & success rate, the baseline's, speedup (baseline mean
+                 flips cost / best's & the same for CPU time, over all blocks), blocks used, survivors & history
+        :raises ValueError: If there are no blocks
+        """
+        if not blocks:
+            raise ValueError("No blocks to race (no instances or seeds)")
+        alive = list(range(len(self.configs)))
+        results = {}  # (config index, block index) --> (cost, solved, cpu_time)
+        history = []  # (blocks run, No. of configurations left)
+        for b, (path, seed) in enumerate(blocks):
+            for index, result in zip(alive, self._evaluate([(path, self.configs[index], seed) for index in alive])):
+                results[index, b] = result
+            if b + 1 >= self.min_blocks and len(alive) > 1:
+                costs = [[results[index, block][0] for index in alive] for block in range(b + 1)]
+                alive = [alive[j] for j in friedman_survivors(costs, self.alpha)]
+                history.append((b + 1, len(alive)))
+            if len(alive) == 1:
+                break
+        used = b + 1
+
+        def mean(index, field):
+            return sum(results[index, block][field] for block in range(used)) / used
+
+        best = min(alive, key=lambda index: mean(index, 0))
+        report = {"best": self.configs[best], "blocks": used, "survivors": [self.configs[i] for i in alive],
+                  "history": history, "best_cost": mean(best, 0),
+                  "best_success_rate": mean(best, 1)}
+        if baseline is not None:
+            # Baseline on every block the best one ran; if it is one of the configurations, the runs it made
+            # before it was dropped are reused
+            base = self.configs.index(baseline) if baseline in self.configs else -1
+            jobs = [block for block in range(used) if (base, block) not in results]
+            for block, result in zip(jobs, self._evaluate([(blocks[block][0], baseline, blocks[block][1])
+                                                           for block in jobs])):
+                results[base, block] = result
+            report.update({"baseline": baseline, "baseline_cost": mean(base, 0),
+                           "baseline_success_rate": mean(base, 1),
+                           "speedup_flips": mean(base, 0) / mean(best, 0) if mean(best, 0) else None,
+                           "speedup_time": mean(base, 2) / mean(best, 2) if mean(best, 2) else None})
+        return report
+
+
+def tune(paths, algorithm, space, params, seeds=3, workers=1, alpha=ALPHA, min_blocks=MIN_BLOCKS,
+         family=instance_family, baseline=None, shuffle_seed=0):
+    """
+    Tunes wp (& tl) per instance family
+    :param paths: Iterable of training CNF files
+    :param algorithm: "gwsat" or "walksat"
+    :param space: Dictionary of parameter --> values, e.g. {"wp": [0.2, 0.4, 0.6], "tl": [3, 5, 10]}
+    :param params: Fixed solve() params (restarts, iterations, max_flips)
+    :param seeds: Runs (seeds) per instance, every (instance, seed) is one block of the race
+    :param workers: #Worker processes
+    :param alpha: Significance level of the elimination tests
+    :param min_blocks: Blocks before the first elimination test
+    :param family: Function path --> family name
+    :param baseline: Configuration for the speedup, BASELINE (parameters in space only) if None
+    :param shuffle_seed: Seed of the block order, so families are raced over a mix of instances
+    :return: Dictionary family --> Tuner.race() report
+    """
+    if seeds < 1:
+        raise ValueError("seeds must be at least 1")
+    configs = grid(space)
+    if baseline is None:
+        baseline = {name: value for name, value in BASELINE.items() if name in space}
+    families = {}
+    for path in paths:
+        families.setdefault(family(path), []).append(path)
+    reports = {}
+    with Tuner(algorithm, configs, params, workers, alpha, min_blocks) as tuner:
+        for name in sorted(families):
+            blocks = [(path, execution_seed(run)) for path in sorted(families[name]) for run in range(seeds)]
+            rand.Random(shuffle_seed).shuffle(blocks)
+            reports[name] = tuner.race(blocks, baseline)
+    return reports
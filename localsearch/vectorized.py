@@ -0,0 +1,113 @@
+import numpy as np
+
+
+class ClauseMatrix:
+    """
+    Clauses as a padded literal matrix (one row per clause, 0 used as padding), so that
+    clause status of one assignment, or a whole batch of assignments, is found in a few array operations
+    instead of checking clauses one at a time.
+    Assignments are indexed by variable (index 0 unused), 1 for True & 0 for False, as in Formula.
+    """
+
+    def __init__(self, literals, num_vars=None):
+        """
+        :param literals: 2D int array of literals, rows padded with 0
+        :param num_vars: No. of variables, highest variable in literals if not given
+        """
+        self.literals = np.asarray(literals, dtype=np.int32).reshape(len(literals), -1)
+        self.var = np.abs(self.literals)
+        self.positive = self.literals > 0
+        self.pad = self.literals == 0
+        self.num_vars = int(self.var.max(initial=0)) if num_vars is None else num_vars
+
+    @classmethod
+    def from_clauses(cls, clauses, num_vars=None):
+        """
+        :param clauses: 2D List of clauses
+        :param num_vars: No. of variables
+        :return: ClauseMatrix
+        """
+        width = max((len(clause_i) for clause_i in clauses), default=0)
+        literals = np.zeros((len(clauses), width), dtype=np.int32)
+        for c_index, clause_i in enumerate(clauses):
+            literals[c_index, :len(clause_i)] = clause_i
+        return cls(literals, num_vars)
+
+    @classmethod
+    def from_formula(cls, formula):
+        """
+        :param formula: Formula (CSR clause storage)
+        :return: ClauseMatrix
+        """
+        offsets = np.frombuffer(formula.offsets, dtype=np.int32)
+        flat = np.frombuffer(formula.literals, dtype=np.int32)
+        lengths = np.diff(offsets)
+        literals = np.zeros((formula.num_clauses, int(lengths.max(initial=0))), dtype=np.int32)
+        rows = np.repeat(np.arange(formula.num_clauses), lengths)
+        cols = np.arange(len(flat)) - np.repeat(offsets[:-1], lengths)
+        literals[rows, cols] = flat
+        return cls(literals, formula.num_vars)
+
+    def true_literals(self, values):
+        """
+        :param values: Assignment (num_vars + 1) or batch of assignments (B x num_vars + 1)
+        :return: Bool array (m x k) or (B x m x k), True where the literal is satisfied
+        """
+        values = np.asarray(values).astype(bool, copy=False)
+        return (values[..., self.var] == self.positive) & ~self.pad
+
+    def true_count(self, values):
+        """
+        :param values: Assignment or batch of assignments
+        :return: No. of true literals of each clause, (m) or (B x m)
+        """
+        return self.true_literals(values).sum(axis=-1)
+
+    def unsat_mask(self, values):
+        """
+        :param values: Assignment or batch of assignments
+        :return: Bool array (m) or (B x m), True where the clause is unsat
+        """
+        return ~self.true_literals(values).any(axis=-1)
+
+    def unsat_count(self, values):
+        """
+        :param values: Assignment or batch of assignments
+        :return: No. of unsat clauses, int or array (B)
+        """
+        return self.unsat_mask(values).sum(axis=-1)
+
+    def flip_batch(self, values, variables=None):
+        """
+        Batch of assignments, each with one variable flipped
+        :param values: Assignment (num_vars + 1)
+        :param variables: Variables to be flipped, all variables if not given
+        :return: Array (len(variables) x num_vars + 1), row i has variables[i] flipped
+        """
+        values = np.asarray(values, dtype=np.uint8)
+        if variables is None:
+            variables = np.arange(1, self.num_vars + 1)
+        variables = np.asarray(variables)
+        batch = np.repeat(values[None, :], len(variables), axis=0)
+        batch[np.arange(len(variables)), variables] ^= 1
+        return batch
+
+    def flip_unsat_counts(self, values):
+        """
+        No. of unsat clauses after flipping each single variable (what GSAT considers), without building the batch:
+        #unsat after flip = #unsat - make + break
+        :param values: Assignment (num_vars + 1)
+        :return: Array (num_vars + 1), index var has #unsat after flipping var (index 0 has current #unsat)
+        """
+        true_lits = self.true_literals(values)
+        count = true_lits.sum(axis=-1)
+        unsat = count == 0
+        # make: every variable of an unsat clause satisfies it when flipped
+        make_vars = self.var[unsat][~self.pad[unsat]]
+        make = np.bincount(make_vars, minlength=self.num_vars + 1)
+        # break: the only true literal of a clause makes it unsat when flipped
+        critical = count == 1
+        brk = np.bincount(self.var[critical][true_lits[critical]], minlength=self.num_vars + 1)
+        result = int(unsat.sum()) - make + brk
+        result[0] = int(unsat.sum())
+        return result
@@ -0,0 +1,155 @@
+from .adaptive import AdaptiveNoise
+from .restarts import FIXED, RestartSchedule, initial_assignment
+from .rng import RandomStream
+from .scores import IncrementalScores
+from .stats import STOP_CHECK, BestAssignment, deadline_after, report_run, stop_reason
+
+
+def WalkSAT(scores, tl, flip_iter_dic, c_iter, wp, rng, monitor=None):
+    """
+    Full WalkSAT + Tabu functionality is computed here.
+    We Select a random clause, then check each variable from that to be in tabu or not,
+    if not then we take its negative gain, i.e. No. of clauses which become unsat if it is flipped (break count).
+    Once done with all variables in that clause, we take variable with
+    1. If negative_gain == 0, and flip it.
+    2. Else, we compute random()<wp,
+        i. If true, then take any variable from clause randomly which is not in tabu & flip it.
+        ii. Else, take variable with minimum Negative Gain, and flip it.
+    Negative gains are read from the maintained break counts, and the flip updates only the clauses where
+    the variable occurs, so no full clause check is done here.
+    :param scores: IncrementalScores of the current solution, updated in place
+    :param tl: Length of tabu (Max no. of variable that can be stored)
+    :param flip_iter_dic: Keeps the track of iterations where variables can be flipped next time
+    :param c_iter: current iteration
+    :param wp: walk probability
+    :param rng: RandomStream of the run
+    :param monitor: Optional SearchMonitor, counts moves & tabu blocked variables & times pick/flip phases
+    :return: Variable flipped, 0 if all variables of the clause are tabu (solution found when scores.unsat is empty)
+    """
+    if monitor is not None:
+        start = monitor.clock()
+
+    rand_unsat_clause = scores.formula.clause(scores.unsat.random_item(rng))  # Choose one clause at random from unsat clauses
+    negative_gain_dic = {}  # Dictionary to store negative gain for each variable
+    for var in rand_unsat_clause:  # Taking each var from chosen unsat clause
+        # Check for give variable(key), what is the next iteration where it can flipped,
+        # If its value is greater than current iteration, implies it is flipped with last tl moves,
+        # hence can't be flipped. So, we move to next variable
+        if flip_iter_dic[abs(var)] > c_iter:
+            if monitor is not None:
+                monitor.count("tabu_blocked")
+            continue
+        negative_gain_dic[var] = scores.brk[abs(var)]
+
+    if len(negative_gain_dic) != 0:  # Go ahead when at least 1 var have potential to be flipped
+        neg_zero = [k for k, v in negative_gain_dic.items() if v == 0]  # find all variables with neg gain == 0
+        if len(neg_zero) != 0:  # If neg_zero list is not empty --> 1 or more var have neg_gain == 0
+            var_flip = rng.choice(neg_zero)  # Choose one var at random (breaking the ties)
+            move = "freebie"
+        else:  # Neg_gain list is empty
+            r = rng.random()  # generate random between 0 & 1
+            if r < wp:  # compare with wp
+                # Choose any variable from unsat clause, which is not in tabu as var_flip
+                var_flip = rng.choice(list(negative_gain_dic.keys()))
+                move = "random_walk"
+            else:
+                # Choose variable with minimum negative gain from unsat clause as var_flip
+                min_neg_gain = min(negative_gain_dic.values())
+                # Check if there are multiple variable with minimum negative gain and choose one randomly
+                var_flip = rng.choice([k for k, v in negative_gain_dic.items() if v == min_neg_gain])
+                move = "greedy"
+        if monitor is not None:
+            monitor.add_time("pick", start)
+            start = monitor.clock()
+        scores.flip(abs(var_flip))  # Flip the variable & update the counts
+        if monitor is not None:
+            monitor.add_time("flip", start)
+            monitor.step(move, len(scores.unsat))
+        # update the next iteration where var_flip variable can be filpped next
+        # this iteration will be tl iterations from current iteration. Hence current iter + tl
+        flip_iter_dic[abs(var_flip)] = c_iter + tl
+        return abs(var_flip)
+    else: # No var from unsat clause can be flipped. Hence, No Solution found in this iteration.
+        if monitor is not None:
+            monitor.add_time("pick", start)
+            monitor.count("all_tabu")
+        return 0
+
+
+def WalkSAT_Tabu(restart, iterations, variables, formula, wp, tl, stop=None, stats=None, monitor=None,
+                 max_flips=None, time_limit=None, restart_policy=FIXED, phase_saving=None,
+                 warm_start=None, rng=None):
+    """
+    WalkSAT with Tabu, with restarts, iterations & random_initlization. One full execution.
+    :param restart: #Restarts given by user
+    :param iterations: #iterations given by user
+    :param variables: # List of variables involved in all clauses
+    :param formula: Formula of all clauses
+    :param wp: walk probability, or ADAPTIVE to adapt it to search progress (AdaptiveNoise)
+    :param tl: Length of tabu, or ADAPTIVE
+    :param stop: Optional Event, search gives up & returns -1 once it is set (e.g. another portfolio member won)
+    :param stats: Optional dictionary, filled by report_run(): flips over all restarts, status, best_unsat & best
+                  (assignment with fewest unsat clauses seen, an anytime answer when no solution is found)
+    :param monitor: Optional SearchMonitor (counters, phase timers, best unsat trace)
+    :param max_flips: Optional flip budget over all restarts
+    :param time_limit: Optional wall-clock budget (seconds) over all restarts
+    :param restart_policy: How long each restart runs, one of RESTART_POLICIES (FIXED: #iterations each)
+    :param phase_saving: Optional share of variables perturbed when restarting from the best assignment seen,
+                         instead of a fresh random one
+    :param warm_start: Optional List of literals the first restart starts from instead of a random assignment,
+                       e.g. the model of a nearly identical formula, so only the clauses it violates get repaired
+    :param rng: RandomStream this run draws every random number from, one seeded from the global random module if None
+    :return: Solution List if solution found else -1
+    """
+    deadline = deadline_after(time_limit)
+    rng = RandomStream() if rng is None else rng
+    best = BestAssignment(formula.num_vars)
+    schedule = RestartSchedule(restart_policy, iterations)
+    noise = AdaptiveNoise.for_params(formula, wp, tl)
+    walk_prob, tabu_len = (wp, tl) if noise is None else (noise.wp, noise.tl)
+    flips = 0  # Flips made in finished restarts
+    for i in list(range(restart)):  # no. of restarts
+        if monitor is not None:
+            start = monitor.clock()
+        # Random initial, the warm start on the first restart, or the best so far perturbed with phase saving
+        scores = IncrementalScores(formula, initial_assignment(variables, formula, best, rng, phase_saving,
+                                                     warm_start if i == 0 else None))
+        best.restart(scores.value, len(scores.unsat))
+        if noise is not None:
+            noise.restart(len(scores.unsat))
+        if monitor is not None:
+            monitor.add_time("init", start)
+            monitor.restart(len(scores.unsat))
+        # Tabu Dic to store variables as keys and their next iteration where this variable can be flipped as value
+        # Initializing all variable with 0, as any of them can be flipped
+        tabu_dic = dict.fromkeys(sorted(variables), 0)
+        # Check if solution exist in random initial
+        if len(scores.unsat) == 0:
+            report_run(stats, "solved", flips, formula, best)
+            return scores.solution()
+        for j in schedule.steps(len(scores.unsat)):
+            if j % STOP_CHECK == 0:
+                reason = stop_reason(stop, deadline)
+                if reason is not None:
+                    report_run(stats, reason, flips + scores.flips, formula, best)
+                    return -1
+            if max_flips is not None and flips + scores.flips >= max_flips:
+                report_run(stats, "flip_budget", flips + scores.flips, formula, best)
+                return -1
+            #     Calling walkSat, it updates scores & tabu_dic in place
+            var_flip = WalkSAT(scores, tabu_len, tabu_dic, j, walk_prob, rng, monitor)
+            if var_flip:
+                best.flipped(var_flip, len(scores.unsat))
+            if noise is not None:
+                noise.update(len(scores.unsat))
+                walk_prob, tabu_len = noise.wp, noise.tl
+
+            if len(scores.unsat) == 0:  # No unsat clause is left, solution found
+                report_run(stats, "solved", flips + scores.flips, formula, best)
+                return scores.solution()
+            if schedule.patience is not None and schedule.stagnated(len(scores.unsat)):
+                break
+        flips += scores.flips
+    # If solution doesn't exist in any restart, then return -1
+    report_run(stats, "exhausted", flips, formula, best)
+    return -1
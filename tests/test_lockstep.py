@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from localsearch.formula import Formula  # noqa: E402
+from localsearch.lockstep import LockstepWalkers  # noqa: E402
+
+NUM_VARS = 10
+WALKERS = 4
+
+
+def brute_force(clauses, value):
+    # true_count, make & brk of one walker recomputed from scratch
+    true_count = []
+    make = [0] * (NUM_VARS + 1)
+    brk = [0] * (NUM_VARS + 1)
+    for clause in clauses:
+        true_vars = [abs(literal) for literal in clause if (value[abs(literal)] == 1) == (literal > 0)]
+        true_count.append(len(true_vars))
+        if not true_vars:
+            for literal in clause:
+                make[abs(literal)] += 1
+        elif len(true_vars) == 1:
+            brk[true_vars[0]] += 1
+    return true_count, make, brk
+
+
+def check(walkers, clauses):
+    for walker in range(WALKERS):
+        true_count, make, brk = brute_force(clauses, walkers.values[walker])
+        assert walkers.true_count[walker, :-1].tolist() == true_count
+        assert walkers.unsat_count[walker] == true_count.count(0)
+        assert walkers.make[walker].tolist() == make
+        assert walkers.brk[walker].tolist() == brk
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_flips_match_brute_force(seed):
+    rng = random.Random(seed)
+    clauses = [[rng.choice((1, -1)) * rng.randint(1, NUM_VARS) for _ in range(rng.randint(1, 4))]
+               for _ in range(40)]
+    formula = Formula.from_clauses(clauses, NUM_VARS)
+    walkers = LockstepWalkers(formula, WALKERS, np.random.default_rng(seed))
+    clauses = formula.clauses()
+    check(walkers, clauses)
+    for _ in range(200):
+        walkers.flip(np.array([rng.randint(0, NUM_VARS) for _ in range(WALKERS)]))  # 0: that walker stays
+        check(walkers, clauses)
@@ -0,0 +1,48 @@
+import itertools
+import random
+
+import pytest
+
+from localsearch.preprocess import preprocess
+
+NUM_VARS = 8
+
+
+def satisfies(clauses, sol):
+    true = set(sol)
+    return all(any(literal in true for literal in clause) for clause in clauses)
+
+
+def models(clauses, num_vars):
+    # Every satisfying assignment, as lists of literals over 1..num_vars
+    for signs in itertools.product((1, -1), repeat=num_vars):
+        sol = [sign * var for var, sign in zip(range(1, num_vars + 1), signs)]
+        if satisfies(clauses, sol):
+            yield sol
+
+
+def random_clauses(rng):
+    # Short clauses, so units, pure literals & conflicts all come up
+    clauses = [[rng.choice((1, -1)) * rng.randint(1, NUM_VARS) for _ in range(rng.randint(1, 3))]
+               for _ in range(rng.randint(5, 25))]
+    clauses.append([2, -2, 3])
+    return clauses
+
+
+@pytest.mark.parametrize("subsumption", [False, True])
+@pytest.mark.parametrize("seed", range(40))
+def test_extend_maps_models_back(seed, subsumption):
+    clauses = random_clauses(random.Random(seed))
+    simplification = preprocess(clauses, NUM_VARS, subsumption)
+    satisfiable = next(models(clauses, NUM_VARS), None) is not None
+    if simplification.unsat:
+        assert not satisfiable
+        return
+    reduced = simplification.formula().clauses()
+    reduced_models = list(models(reduced, simplification.num_vars))
+    assert bool(reduced_models) == satisfiable
+    for sol in reduced_models:
+        extended = simplification.extend(sol)
+        assert len(extended) == NUM_VARS
+        assert satisfies(clauses, extended)
+        assert simplification.reduce(extended) == sol
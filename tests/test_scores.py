@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from localsearch.formula import Formula
+from localsearch.scores import BucketScores, IncrementalScores, WeightedBucketScores, WeightedScores
+
+NUM_VARS = 12
+
+
+def random_clauses(rng, num_vars=NUM_VARS, num_clauses=50):
+    # Random 1..4 literal clauses, repeated literals & tautologies included on purpose
+    clauses = []
+    for _ in range(num_clauses):
+        clause = [rng.choice((1, -1)) * rng.randint(1, num_vars) for _ in range(rng.randint(1, 4))]
+        clauses.append(clause)
+    clauses.append([3, -3, 4])
+    clauses.append([5, 5, -6])
+    return clauses
+
+
+def is_true(value, literal):
+    return (value[abs(literal)] == 1) == (literal > 0)
+
+
+def brute_force(scores):
+    # make & brk by flipping each variable & re-checking every clause, unsat clauses of the current assignment
+    formula = scores.formula
+    clauses = [formula.clause(c_index) for c_index in range(formula.num_clauses)]
+    unsat = {c_index for c_index, clause in enumerate(clauses)
+             if not any(is_true(scores.value, literal) for literal in clause)}
+    make = [0] * (formula.num_vars + 1)
+    brk = [0] * (formula.num_vars + 1)
+    for var in range(1, formula.num_vars + 1):
+        flipped = bytearray(scores.value)
+        flipped[var] ^= 1
+        for c_index, clause in enumerate(clauses):
+            now_sat = any(is_true(flipped, literal) for literal in clause)
+            if c_index in unsat and now_sat:
+                make[var] += scores.weight[c_index]
+            elif c_index not in unsat and not now_sat:
+                brk[var] += scores.weight[c_index]
+    return make, brk, unsat
+
+
+def check(scores):
+    make, brk, unsat = brute_force(scores)
+    assert scores.make.tolist() == make
+    assert scores.brk.tolist() == brk
+    assert set(scores.unsat.items) == unsat
+    assert all(scores.unsat.items[scores.unsat.pos[c_index]] == c_index for c_index in unsat)
+    buckets = scores.buckets
+    if buckets is not None:
+        gains = [make[var] - brk[var] for var in range(1, scores.formula.num_vars + 1)]
+        assert buckets.top == max(gains)
+        for var in range(1, scores.formula.num_vars + 1):
+            gain = make[var] - brk[var]
+            assert buckets.gain[var] == gain
+            assert buckets.buckets[gain][buckets.pos[var]] == var
+        assert sum(len(bucket) for bucket in buckets.buckets.values()) == scores.formula.num_vars
+
+
+@pytest.mark.parametrize("score_class", [IncrementalScores, WeightedScores, BucketScores, WeightedBucketScores])
+@pytest.mark.parametrize("seed", range(5))
+def test_flips_match_brute_force(score_class, seed):
+    rng = random.Random(seed)
+    formula = Formula.from_clauses(random_clauses(rng), NUM_VARS)
+    value = bytearray(rng.randint(0, 1) for _ in range(NUM_VARS + 1))
+    scores = score_class(formula, value)
+    scores.smooth_every = 3  # Smooth often, so weights go up & down
+    check(scores)
+    for step in range(200):
+        scores.flip(rng.randint(1, NUM_VARS))
+        if step % 7 == 0 and hasattr(scores, "bump"):
+            scores.bump()  # Every 3rd bump also smooths
+        check(scores)
+
+
+def test_tautologies_dropped():
+    formula = Formula.from_clauses([[3, -3, 4], [1, 2], [-1, 4, 4]])
+    assert formula.num_vars == 4
+    assert formula.clauses() == [[1, 2], [-1, 4]]